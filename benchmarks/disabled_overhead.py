@@ -0,0 +1,124 @@
+"""Compare a disabled pytest-fluent plugin with not loading the plugin at all.
+
+A temporary suite of parametrized tests is run repeatedly with
+``-p no:fluent-logging`` and with ``--fluentd-disable``. Both variants are run
+alternately in order to spread system noise evenly.
+
+The script fails if the total time of the disabled plugin exceeds the
+baseline by more than the tolerance. Since the total time of large suites
+hides a slow startup and the total time of small suites hides a slow test
+run, both parts are also checked on their own: The startup time, mostly the
+import of the plugin, is measured by a suite with a single test and must not
+exceed the baseline by more than the startup budget. It is subtracted from the
+suite time to get the per-test time, which must not exceed the baseline by
+more than the tolerance. The per-test times of suites with less than
+MIN_TESTS tests are dominated by noise, so they are rejected.
+
+The bytecode is written and used even if PYTHONDONTWRITEBYTECODE is set, as
+in installed packages.
+
+Usage:
+    python benchmarks/disabled_overhead.py [--tests 2000] [--runs 7]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import typing
+
+MIN_TESTS = 1000
+
+TEST_MODULE = """
+import pytest
+
+@pytest.mark.parametrize("value", range({tests}))
+def test_value(value):
+    assert value >= 0
+"""
+
+
+def measure(directory: str, args: typing.List[str]) -> float:
+    env = dict(os.environ)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider", *args],
+        cwd=directory,
+        env=env,
+        check=True,
+        stdout=subprocess.DEVNULL,
+    )
+    return time.perf_counter() - start
+
+
+def measure_fastest(
+    directories: typing.List[str], variants: typing.List[typing.List[str]], runs: int
+) -> typing.List[typing.List[float]]:
+    """Return the fastest run of each variant in each directory."""
+    fastest = [[float("inf")] * len(variants) for _ in directories]
+    for _ in range(runs):
+        for i, directory in enumerate(directories):
+            for j, variant in enumerate(variants):
+                fastest[i][j] = min(fastest[i][j], measure(directory, variant))
+    return fastest
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tests", type=int, default=2000)
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.05,
+        help="Allowed relative overhead of the disabled plugin",
+    )
+    parser.add_argument(
+        "--startup-budget-ms",
+        type=float,
+        default=20.0,
+        help="Allowed startup overhead of the disabled plugin",
+    )
+    args = parser.parse_args()
+    if args.tests < MIN_TESTS:
+        parser.error(f"--tests must be at least {MIN_TESTS}")
+
+    variants = [["-p", "no:fluent-logging"], ["--fluentd-disable"]]
+    with tempfile.TemporaryDirectory() as suite_dir:
+        with tempfile.TemporaryDirectory() as startup_dir:
+            for directory, tests in [(suite_dir, args.tests), (startup_dir, 1)]:
+                with open(os.path.join(directory, "test_overhead.py"), "w") as fid:
+                    fid.write(TEST_MODULE.format(tests=tests))
+                # Warm up caches and bytecode
+                for variant in variants:
+                    measure(directory, variant)
+            suite, startup = measure_fastest(
+                [suite_dir, startup_dir], variants, args.runs
+            )
+    baseline, disabled = (
+        (suite[i] - startup[i]) / (args.tests - 1) for i in range(len(variants))
+    )
+
+    total_overhead = suite[1] / suite[0] - 1
+    overhead = disabled / baseline - 1
+    startup_overhead = startup[1] - startup[0]
+    print(f"-p no:fluent-logging {suite[0]:8.3f} s")
+    print(f"--fluentd-disable    {suite[1]:8.3f} s ({total_overhead:+.1%})")
+    print(f"Startup overhead     {startup_overhead * 1e3:8.1f} ms")
+    print(f"-p no:fluent-logging {baseline * 1e6:8.1f} us per test")
+    print(f"--fluentd-disable    {disabled * 1e6:8.1f} us per test ({overhead:+.1%})")
+    if total_overhead > args.tolerance:
+        sys.exit(f"Disabled plugin overhead exceeds {args.tolerance:.0%}")
+    if startup_overhead * 1e3 > args.startup_budget_ms:
+        sys.exit(
+            f"Disabled plugin startup overhead exceeds {args.startup_budget_ms:.0f} ms"
+        )
+    if overhead > args.tolerance:
+        sys.exit(f"Disabled plugin per-test overhead exceeds {args.tolerance:.0%}")
+
+
+if __name__ == "__main__":
+    main()
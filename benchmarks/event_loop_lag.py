@@ -0,0 +1,109 @@
+"""Measure the asyncio event loop lag caused by the Fluent logging handlers.
+
+A local TCP server emulates a slow Fluentd instance. While a coroutine emits
+logging records, a ticker coroutine measures how late the event loop wakes up.
+The measurement is repeated without a handler and for each transport.
+
+Usage:
+    python benchmarks/event_loop_lag.py [--records 5000] [--delay 0.01]
+"""
+
+import argparse
+import asyncio
+import logging
+import socket
+import statistics
+import threading
+import time
+import typing
+
+from pytest_fluent.plugin import TRANSPORTS, add_handler
+
+
+def drain(connection: socket.socket, delay: float) -> None:
+    with connection:
+        while connection.recv(1024):
+            time.sleep(delay)
+
+
+def serve(server: socket.socket, delay: float) -> None:
+    while True:
+        try:
+            connection, _ = server.accept()
+        except OSError:
+            return
+        threading.Thread(target=drain, args=(connection, delay), daemon=True).start()
+
+
+async def tick(interval: float, lags: typing.List[float], done: asyncio.Event):
+    loop = asyncio.get_running_loop()
+    while not done.is_set():
+        start = loop.time()
+        await asyncio.sleep(interval)
+        lags.append(loop.time() - start - interval)
+
+
+async def produce(logger: logging.Logger, records: int, done: asyncio.Event):
+    for idx in range(records):
+        logger.info("Benchmark record %s with some payload %s", idx, "x" * 200)
+        if idx % 10 == 0:
+            await asyncio.sleep(0)
+    done.set()
+
+
+async def measure(logger: logging.Logger, records: int) -> typing.List[float]:
+    lags: typing.List[float] = []
+    done = asyncio.Event()
+    await asyncio.gather(tick(0.001, lags, done), produce(logger, records, done))
+    return lags
+
+
+def run(port: int, transport: typing.Optional[str], records: int) -> str:
+    logger = logging.getLogger(f"benchmark.{transport}")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    handler = None
+    if transport is not None:
+        handler = add_handler(
+            "127.0.0.1", port, "benchmark", logger, transport=transport
+        )
+    start = time.perf_counter()
+    lags = asyncio.run(measure(logger, records))
+    duration = time.perf_counter() - start
+    if handler is not None:
+        logger.removeHandler(handler)
+        handler.close()
+    lags_ms = sorted(lag * 1000 for lag in lags) or [0.0]
+    p99 = lags_ms[min(len(lags_ms) - 1, int(len(lags_ms) * 0.99))]
+    return (
+        f"{transport or 'no handler':<12} mean {statistics.mean(lags_ms):8.3f} ms  "
+        f"p99 {p99:8.3f} ms  max {lags_ms[-1]:8.3f} ms  total {duration:6.3f} s"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=5000)
+    parser.add_argument(
+        "--delay",
+        type=float,
+        default=0.01,
+        help="Delay of the emulated Fluentd per received chunk in seconds",
+    )
+    args = parser.parse_args()
+
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+    server.bind(("127.0.0.1", 0))
+    server.listen()
+    port = server.getsockname()[1]
+    threading.Thread(target=serve, args=(server, args.delay), daemon=True).start()
+    try:
+        for transport in [None, *TRANSPORTS]:
+            print(run(port, transport, args.records))
+    finally:
+        server.close()
+
+
+if __name__ == "__main__":
+    main()
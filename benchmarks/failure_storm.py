@@ -0,0 +1,99 @@
+"""Measure the failure message cost of a failure storm for each detail level.
+
+A temporary suite, in which a broken fixture fails every test, is run once with
+a disabled plugin in order to collect the failed reports. Afterwards the report
+records are created for each failure detail level and the time as well as the
+average failure message size are printed.
+
+Usage:
+    python benchmarks/failure_storm.py [--tests 2000] [--max-size 0]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import time
+import typing
+
+import pytest
+
+from pytest_fluent.plugin import FAILURE_DETAILS
+from pytest_fluent.test_report import LogReport
+
+TEST_MODULE = """
+import pytest
+
+def connect(depth):
+    if depth:
+        return connect(depth - 1)
+    raise ConnectionError("Service unavailable")
+
+@pytest.fixture
+def service():
+    try:
+        connect(10)
+    except ConnectionError as exc:
+        raise RuntimeError("Fixture setup failed") from exc
+
+@pytest.mark.parametrize("value", range({tests}))
+def test_value(service, value):
+    assert value >= 0
+"""
+
+
+class ReportCollector:
+    def __init__(self) -> None:
+        self.config: typing.Optional[pytest.Config] = None
+        self.reports: typing.List[pytest.TestReport] = []
+
+    def pytest_configure(self, config: pytest.Config) -> None:
+        self.config = config
+
+    def pytest_runtest_logreport(self, report: pytest.TestReport) -> None:
+        if report.failed:
+            self.reports.append(report)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tests", type=int, default=2000)
+    parser.add_argument(
+        "--max-size",
+        type=int,
+        default=0,
+        help="Maximum failure message size in bytes, 0 disables the limit",
+    )
+    args = parser.parse_args()
+
+    collector = ReportCollector()
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "test_failure_storm.py")
+        with open(path, "w") as fid:
+            fid.write(TEST_MODULE.format(tests=args.tests))
+        with contextlib.redirect_stdout(io.StringIO()):
+            pytest.main(
+                ["-q", "-p", "no:cacheprovider", "--fluentd-disable", path],
+                plugins=[collector],
+            )
+        assert collector.config is not None
+        collector.config.option.failure_message_max_size = args.max_size
+        for detail in FAILURE_DETAILS:
+            collector.config.option.failure_detail = detail
+            log_report = LogReport(collector.config)
+            start = time.perf_counter()
+            records = [
+                log_report.create_report(report, "error")
+                for report in collector.reports
+            ]
+            duration = time.perf_counter() - start
+            size = sum(len(record["failure_message"]) for record in records)
+            print(
+                f"{detail:5} {duration * 1e6 / len(records):10.1f} us/report "
+                f"{size / len(records):10.1f} bytes/report"
+            )
+
+
+if __name__ == "__main__":
+    main()
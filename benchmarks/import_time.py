@@ -0,0 +1,52 @@
+"""Measure the import time of the pytest-fluent plugin.
+
+The plugin module is imported after pytest, as pytest does when loading the
+plugin, in fresh interpreters with ``-X importtime``. The fastest cumulative
+import time is compared with the budget, since slower runs only add noise.
+
+Usage:
+    python benchmarks/import_time.py [--runs 5] [--budget-ms 50]
+"""
+
+import argparse
+import subprocess
+import sys
+
+
+def get_import_time_us(module: str) -> int:
+    """Get the cumulative import time of a module in microseconds."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import pytest; import {module}"],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    for line in result.stderr.splitlines():
+        _, cumulative, name = line.split("|")
+        # Top-level imports are not indented
+        if name.rstrip() == f" {module}":
+            return int(cumulative)
+    raise ValueError(f"Import time of {module} not found")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=50.0,
+        help="Allowed import time of the plugin after pytest",
+    )
+    args = parser.parse_args()
+
+    import_time = min(
+        get_import_time_us("pytest_fluent.plugin") for _ in range(args.runs)
+    )
+    print(f"import pytest_fluent.plugin {import_time / 1000:8.1f} ms")
+    if import_time > args.budget_ms * 1000:
+        sys.exit(f"Import time exceeds the budget of {args.budget_ms:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,7 +7,7 @@ from .additional_information import (
     additional_session_information_callback,
     additional_test_information_callback,
 )
-from .plugin import get_session_uid, get_test_uid
+from .plugin import bind_context, get_session_uid, get_test_uid
 
 __version__ = "unknown"
 try:
@@ -21,6 +21,7 @@ __all__ = [
     "additional_session_information_callback",
     "additional_test_information_callback",
     "additional_information_callback",
+    "bind_context",
     "get_session_uid",
     "get_test_uid",
 ]
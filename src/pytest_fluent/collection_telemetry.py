@@ -0,0 +1,66 @@
+"""Duration, items and errors of the test collection per module."""
+
+import time
+import typing
+
+import pytest
+
+
+class CollectionTelemetry:
+    """Measure the collection of the test files.
+
+    The collection time of a file includes its import and the collection of
+    its classes. Directories and packages are not measured themselves, since
+    their collection contains the collection of their files.
+    """
+
+    def __init__(self) -> None:
+        """Initialize collection telemetry."""
+        self._start_time = time.perf_counter()
+        self._collector_start_times: typing.Dict[str, float] = {}
+        self.modules: typing.Dict[str, dict] = {}
+
+    def start(self) -> None:
+        """Mark the start of the collection."""
+        self._start_time = time.perf_counter()
+
+    def start_collector(self, collector: pytest.Collector) -> None:
+        """Mark the collection start of a test file or one of its classes."""
+        if not any(isinstance(node, pytest.File) for node in collector.listchain()):
+            return
+        self._collector_start_times[collector.nodeid] = time.perf_counter()
+
+    def add_report(self, report: pytest.CollectReport) -> None:
+        """Add the duration, items and error of a collector to its file."""
+        start_time = self._collector_start_times.pop(report.nodeid, None)
+        if start_time is None:
+            return
+        name = report.nodeid.split("::")[0]
+        module = self.modules.get(name)
+        if module is None:
+            module = {"module": name, "duration": 0.0, "items": 0, "errors": 0}
+            self.modules[name] = module
+        module["duration"] += time.perf_counter() - start_time
+        module["items"] += sum(isinstance(node, pytest.Item) for node in report.result)
+        if report.failed:
+            module["errors"] += 1
+
+    def to_dict(self, items: int) -> dict:
+        """Summarize the collection.
+
+        Args:
+            items (int): Number of selected test items.
+
+        Returns:
+            dict: Collection duration in seconds, number of selected items,
+                modules and errors and the modules ordered by their duration,
+                the slowest module first.
+        """
+        modules = sorted(self.modules.values(), key=lambda module: -module["duration"])
+        return {
+            "duration": time.perf_counter() - self._start_time,
+            "items": items,
+            "module_count": len(modules),
+            "errors": sum(module["errors"] for module in modules),
+            "modules": modules,
+        }
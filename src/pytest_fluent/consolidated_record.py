@@ -0,0 +1,66 @@
+"""Per-test state for a single consolidated testcase record."""
+
+import datetime
+import typing
+
+# Outcomes which are overridden by the outcome of a later test phase
+OVERRIDABLE_OUTCOMES = ["passed", "xpassed"]
+
+
+class ConsolidatedRecord:
+    """Collect the data of all test phases in order to send a single record.
+
+    Args:
+        data (dict): Testcase start data.
+        additional_information (dict): Additional information of the test start.
+    """
+
+    def __init__(self, data: dict, additional_information: dict) -> None:
+        """Initialize consolidated record."""
+        self.data = data
+        self.additional_information = additional_information
+        self.durations: typing.Dict[str, float] = {}
+        self.start_time = datetime.datetime.utcnow().isoformat()
+
+    @property
+    def has_outcome(self) -> bool:
+        """Check if a test phase provided an outcome."""
+        return "outcome" in self.data
+
+    def add_duration(self, when: str, duration: float) -> None:
+        """Add the duration of a test phase.
+
+        Args:
+            when (str): Test phase, i.e. setup, call or teardown.
+            duration (float): Duration of the phase in seconds.
+        """
+        self.durations[when] = duration
+
+    def update(self, data: dict, additional_information: dict) -> None:
+        """Merge the report data of a test phase.
+
+        The first failed, skipped or erroneous phase determines the outcome.
+
+        Args:
+            data (dict): Report data of the test phase.
+            additional_information (dict): Additional information of the phase.
+        """
+        if self.data.get("outcome", "passed") not in OVERRIDABLE_OUTCOMES:
+            return
+        self.data.update(data)
+        self.additional_information.update(additional_information)
+
+    def finish(self) -> dict:
+        """Complete the record with the end time and phase durations.
+
+        Returns:
+            dict: Consolidated testcase record.
+        """
+        self.data.update(
+            {
+                "start_time": self.start_time,
+                "finish_time": datetime.datetime.utcnow().isoformat(),
+                "durations": self.durations,
+            }
+        )
+        return self.data
@@ -25,6 +25,10 @@ class ContentPatcher:
         """Initialize content patcher."""
         self._args_settings: argparse.Namespace = args_settings
         self._user_settings: dict = self._stage_settings(user_settings, stage_names)
+        self._dropped_keys: typing.Dict[str, typing.FrozenSet[str]] = {
+            stage_name: self._get_dropped_keys(stage_info)
+            for stage_name, stage_info in self._user_settings.items()
+        }
 
     def _stage_settings(
         self, user_settings: dict, stage_names: typing.List[str]
@@ -59,6 +63,27 @@ class ContentPatcher:
                 patched[stage_name].update({key: value})
         return patched
 
+    @staticmethod
+    def _get_dropped_keys(stage_info: dict) -> typing.FrozenSet[str]:
+        """Collect the content keys which never reach the transmitted data.
+
+        Keys are dropped after they have been replaced, so a key counts as
+        dropped if its replaced name is part of the drop list.
+
+        Args:
+            stage_info (dict): Patched settings of a stage.
+
+        Returns:
+            typing.FrozenSet[str]: Original content keys removed by the settings.
+        """
+        to_drop = set(stage_info.get("drop", []))
+        if not to_drop:
+            return frozenset()
+        replace_keys = stage_info.get("replace", {}).get("keys", {})
+        dropped = {key for key in to_drop if key not in replace_keys}
+        dropped.update(key for key, value in replace_keys.items() if value in to_drop)
+        return frozenset(dropped)
+
     def _patch_value(self, key: str, value: typing.Any) -> typing.Any:
         if key == "replace":
             value = {key: self._patch_value(key, v) for key, v in value.items()}
@@ -96,6 +121,19 @@ class ContentPatcher:
         """
         return self._user_settings
 
+    def get_dropped_keys(self, stage_name: str) -> typing.FrozenSet[str]:
+        """Return the content keys dropped for the corresponding stage.
+
+        Expensive content can be skipped if its key is part of the result.
+
+        Args:
+            stage_name (str): Stage name.
+
+        Returns:
+            typing.FrozenSet[str]: Original content keys removed by the settings.
+        """
+        return self._dropped_keys.get(stage_name, frozenset())
+
     def get_tag_and_label(
         self, stage_name: typing.Optional[str] = None
     ) -> typing.Tuple[str, str]:
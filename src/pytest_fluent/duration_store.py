@@ -0,0 +1,102 @@
+"""Local SQLite store of historical test durations."""
+
+import contextlib
+import sqlite3
+import typing
+
+# Weight of the latest duration in the exponentially smoothed duration
+SMOOTHING = 0.3
+
+
+class DurationStore:
+    """Keep an exponentially smoothed duration per test node ID.
+
+    Args:
+        path (str): Path of the SQLite database file, which is created if it
+            does not exist.
+        table (str, optional): Table of the durations, e.g. in order to store
+            the durations of the test phases separately. Defaults to durations.
+    """
+
+    def __init__(self, path: str, table: str = "durations") -> None:
+        """Initialize duration store."""
+        self._path = path
+        self._table = table
+        with contextlib.closing(self._connect()) as connection, connection:
+            connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} ("
+                "nodeid TEXT PRIMARY KEY, duration REAL NOT NULL, "
+                "runs INTEGER NOT NULL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        # Wait for concurrent writers, e.g. other shards sharing the file
+        return sqlite3.connect(self._path, timeout=30)
+
+    def load(self) -> typing.Dict[str, float]:
+        """Load the smoothed durations of all tests.
+
+        Returns:
+            typing.Dict[str, float]: Duration in seconds per node ID.
+        """
+        with contextlib.closing(self._connect()) as connection:
+            return dict(
+                connection.execute(f"SELECT nodeid, duration FROM {self._table}")
+            )
+
+    def update(self, durations: typing.Dict[str, float]) -> None:
+        """Merge the durations of a run into the store.
+
+        Args:
+            durations (typing.Dict[str, float]): Duration in seconds per node ID.
+        """
+        with contextlib.closing(self._connect()) as connection, connection:
+            connection.executemany(
+                f"INSERT INTO {self._table} (nodeid, duration, runs) VALUES (?, ?, 1) "
+                "ON CONFLICT(nodeid) DO UPDATE SET "
+                "duration = (1 - ?) * duration + ? * excluded.duration, "
+                "runs = runs + 1",
+                [
+                    (nodeid, duration, SMOOTHING, SMOOTHING)
+                    for nodeid, duration in durations.items()
+                ],
+            )
+
+
+def order_by_duration(
+    items: list, durations: typing.Dict[str, float], depth: int = 0
+) -> list:
+    """Order test items by their duration, longest first.
+
+    The tests of a module or class are kept together, so that fixtures of a
+    module or class scope are set up once. The modules are ordered by the
+    summed duration of their tests, then the classes and tests within each
+    module and the tests within each class. Tests without a known duration
+    are ordered first, since they might be the longest. The order of equal
+    durations is kept.
+
+    Args:
+        items (list): Test items providing a node ID.
+        durations (typing.Dict[str, float]): Duration in seconds per node ID.
+        depth (int, optional): Number of node ID parts shared by the items.
+            Defaults to 0.
+
+    Returns:
+        list: Ordered test items.
+    """
+    groups: typing.Dict[str, list] = {}
+    for item in items:
+        key = "::".join(item.nodeid.split("::")[: depth + 1])
+        groups.setdefault(key, []).append(item)
+    ordered = []
+    for key, group in sorted(
+        groups.items(),
+        key=lambda entry: -sum(
+            durations.get(item.nodeid, float("inf")) for item in entry[1]
+        ),
+    ):
+        if any(item.nodeid != key for item in group):
+            ordered.extend(order_by_duration(group, durations, depth + 1))
+        else:
+            ordered.extend(group)
+    return ordered
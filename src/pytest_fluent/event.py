@@ -1,13 +1,61 @@
 """Custom Event class."""
 
 import logging
+import os
+import sys
 import time
 import typing
+import weakref
 
+from fluent.asyncsender import FluentSender as AsyncFluentSender
 from fluent.sender import FluentSender
 
 LOGGER = logging.getLogger(__package__)
 
+# Objects holding sender connections which must not be shared with forked
+# children, mapped to their reset callable.
+_AFTER_FORK_RESETS: "weakref.WeakKeyDictionary[typing.Any, typing.Callable]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def register_after_fork_reset(
+    instance: typing.Any, reset: typing.Callable[[typing.Any], None]
+) -> None:
+    """Reset the connections of an instance in forked child processes.
+
+    The parent's sockets, pending buffers and locks are dropped without closing
+    or flushing them, so that the child creates its own connection on first use.
+
+    Args:
+        instance (typing.Any): Object holding Fluent senders.
+        reset (typing.Callable[[typing.Any], None]): Callable dropping the
+            senders of the given instance.
+    """
+    _AFTER_FORK_RESETS[instance] = reset
+
+
+def _reset_after_fork() -> None:
+    for instance, reset in list(_AFTER_FORK_RESETS.items()):
+        reset(instance)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def is_event_loop_running() -> bool:
+    """Check if an asyncio event loop is running in the current thread."""
+    # No loop can be running if asyncio was never imported
+    asyncio = sys.modules.get("asyncio")
+    if asyncio is None:
+        return False
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
 
 class Event:
     """Customized Event class for sending different tags.
@@ -15,6 +63,8 @@ class Event:
     Args:
             host (str): Host name of the Fluent instance. Defaults to "localhost".
             port (int): Port of the Fluent instance. Defaults to 24224.
+            background (bool): Send from a dedicated thread instead of blocking
+                the caller. Defaults to False.
     """
 
     def __init__(
@@ -22,14 +72,39 @@ class Event:
         tags: typing.List[str],
         host: str = "localhost",
         port: int = 24224,
+        background: bool = False,
         **kwargs,
     ) -> None:
         """Initialize custom event class."""
-        self.senders = {
-            tag: FluentSender(tag=tag, host=host, port=port, **kwargs)
-            for tag in tags
-            if tag
-        }
+        self._tags = {tag for tag in tags if tag}
+        self._host = host
+        self._port = port
+        self._background = background
+        self._kwargs = kwargs
+        self.senders: typing.Dict[str, FluentSender] = {}
+        register_after_fork_reset(self, Event.reset_senders)
+
+    def close(self) -> None:
+        """Flush and stop background senders."""
+        if not self._background:
+            return
+        for sender_ in self.senders.values():
+            sender_.close()
+        self.senders = {}
+
+    def reset_senders(self) -> None:
+        """Drop all senders, they are created again on first use."""
+        self.senders = {}
+
+    def _get_sender(self, tag: str) -> typing.Optional[FluentSender]:
+        sender_ = self.senders.get(tag)
+        if sender_ is None and tag in self._tags:
+            sender_class = AsyncFluentSender if self._background else FluentSender
+            sender_ = self.senders.setdefault(
+                tag,
+                sender_class(tag=tag, host=self._host, port=self._port, **self._kwargs),
+            )
+        return sender_
 
     def __call__(self, tag: str, label: str, data: dict, **kwargs):
         """Send a new event.
@@ -43,7 +118,7 @@ class Event:
         # Return if tag is empty string
         if not tag:
             return
-        sender_ = self.senders.get(tag)
+        sender_ = self._get_sender(tag)
         if sender_ is None or not isinstance(sender_, FluentSender):
             LOGGER.warning("Could not retrieve fluent instance for tag %s", tag)
             return
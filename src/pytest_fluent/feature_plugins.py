@@ -0,0 +1,111 @@
+"""Hook implementations which are only registered if their feature is enabled.
+
+The hooks are not methods of the runtime, since each of its hook methods is a
+stage of the stage settings. Registering them separately also avoids their
+overhead for all sessions which do not use the feature.
+"""
+
+import functools
+import time
+import typing
+
+import pytest
+
+from .collection_telemetry import CollectionTelemetry
+from .fixture_timing import FixtureTimer
+
+if typing.TYPE_CHECKING:
+    from .plugin import FluentLoggerRuntime
+
+
+class SlimReportsPlugin:
+    """Slim the reports sent from pytest-xdist workers to the controller."""
+
+    def __init__(self, runtime: "FluentLoggerRuntime") -> None:
+        """Initialize plugin."""
+        self._runtime = runtime
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_report_to_serializable(self, config, report):
+        """Slim the serialized report."""
+        outcome = yield
+        data = outcome.get_result()
+        if data is not None:
+            self._runtime.slim_serialized_report(report, data)
+
+
+class OrderByDurationPlugin:
+    """Order the collected test items by their stored duration."""
+
+    def __init__(self, runtime: "FluentLoggerRuntime") -> None:
+        """Initialize plugin."""
+        self._runtime = runtime
+
+    def pytest_collection_modifyitems(self, session, config, items):
+        """Order the collected test items."""
+        self._runtime.order_items(items)
+
+
+class RegressionsPlugin:
+    """Summarize the largest duration regressions."""
+
+    def __init__(self, runtime: "FluentLoggerRuntime") -> None:
+        """Initialize plugin."""
+        self._runtime = runtime
+
+    def pytest_terminal_summary(self, terminalreporter):
+        """Write the regressions to the terminal summary."""
+        self._runtime.report_regressions(terminalreporter)
+
+
+class FixtureTimingPlugin:
+    """Measure the setup and teardown times of the fixtures."""
+
+    def __init__(self, fixture_timer: FixtureTimer) -> None:
+        """Initialize plugin."""
+        self._fixture_timer = fixture_timer
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_fixture_setup(self, fixturedef, request):
+        """Measure the setup time of the fixtures."""
+        start_time = time.perf_counter()
+        yield
+        self._fixture_timer.add_setup(fixturedef, time.perf_counter() - start_time)
+        # The finalizers run in reverse order, i.e. before the fixture teardown
+        fixturedef.addfinalizer(
+            functools.partial(self._fixture_timer.start_teardown, fixturedef)
+        )
+
+    def pytest_fixture_post_finalizer(self, fixturedef, request):
+        """Measure the teardown time of the fixtures."""
+        self._fixture_timer.finish_teardown(fixturedef)
+
+
+class CollectionTelemetryPlugin:
+    """Measure the collection of the test files."""
+
+    def __init__(
+        self,
+        runtime: "FluentLoggerRuntime",
+        collection_telemetry: CollectionTelemetry,
+    ) -> None:
+        """Initialize plugin."""
+        self._runtime = runtime
+        self._collection_telemetry = collection_telemetry
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_collection(self, session):
+        """Mark the start of the collection."""
+        self._collection_telemetry.start()
+
+    def pytest_collectstart(self, collector):
+        """Mark the collection start of a collector."""
+        self._collection_telemetry.start_collector(collector)
+
+    def pytest_collectreport(self, report):
+        """Add the collection result of a collector."""
+        self._collection_telemetry.add_report(report)
+
+    def pytest_collection_finish(self, session):
+        """Send the collection telemetry."""
+        self._runtime.send_collection_telemetry(len(session.items))
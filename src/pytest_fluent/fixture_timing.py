@@ -0,0 +1,95 @@
+"""Setup and teardown times of the fixtures."""
+
+import time
+import typing
+
+
+class FixtureTimer:
+    """Measure the setup and teardown times of the fixtures of a test.
+
+    The times are collected until they are taken at the end of the test
+    teardown. Higher scoped fixtures are attributed to the tests in which
+    they are set up or torn down.
+    """
+
+    def __init__(self) -> None:
+        """Initialize fixture timer."""
+        self._timings: typing.Dict[typing.Tuple[str, str], dict] = {}
+        self._teardown_start_times: typing.Dict[int, float] = {}
+
+    def _get_timing(self, fixturedef) -> dict:
+        key = (fixturedef.argname, fixturedef.scope)
+        timing = self._timings.get(key)
+        if timing is None:
+            timing = {"name": fixturedef.argname, "scope": fixturedef.scope}
+            self._timings[key] = timing
+        return timing
+
+    def add_setup(self, fixturedef, duration: float) -> None:
+        """Add the setup time of a fixture in seconds."""
+        self._get_timing(fixturedef)["setup"] = duration
+
+    def start_teardown(self, fixturedef) -> None:
+        """Mark the start of the teardown of a fixture."""
+        self._teardown_start_times[id(fixturedef)] = time.perf_counter()
+
+    def finish_teardown(self, fixturedef) -> None:
+        """Mark the finish of the teardown of a fixture."""
+        start_time = self._teardown_start_times.pop(id(fixturedef), None)
+        if start_time is None:
+            return
+        self._get_timing(fixturedef)["teardown"] = time.perf_counter() - start_time
+
+    def pop_timings(self) -> typing.List[dict]:
+        """Take the fixture times collected since the last call.
+
+        Returns:
+            typing.List[dict]: Name, scope and the setup and/or teardown time
+                in seconds per fixture.
+        """
+        timings = list(self._timings.values())
+        self._timings = {}
+        return timings
+
+
+class FixtureStatistics:
+    """Aggregate the fixture times of a session."""
+
+    def __init__(self) -> None:
+        """Initialize fixture statistics."""
+        self.fixtures: typing.Dict[typing.Tuple[str, str], dict] = {}
+
+    def add(self, timings: typing.List[dict]) -> None:
+        """Add the fixture times of a test, see FixtureTimer.pop_timings."""
+        for timing in timings:
+            key = (timing["name"], timing["scope"])
+            statistics = self.fixtures.get(key)
+            if statistics is None:
+                statistics = {
+                    "name": timing["name"],
+                    "scope": timing["scope"],
+                    "setups": 0,
+                    "setup_total": 0.0,
+                    "setup_max": 0.0,
+                    "teardowns": 0,
+                    "teardown_total": 0.0,
+                    "teardown_max": 0.0,
+                }
+                self.fixtures[key] = statistics
+            for phase in ["setup", "teardown"]:
+                if phase not in timing:
+                    continue
+                statistics[f"{phase}s"] += 1
+                statistics[f"{phase}_total"] += timing[phase]
+                statistics[f"{phase}_max"] = max(
+                    statistics[f"{phase}_max"], timing[phase]
+                )
+
+    def to_records(self) -> typing.List[dict]:
+        """Create one record per fixture, the most expensive fixture first."""
+        return sorted(
+            self.fixtures.values(),
+            key=lambda statistics: -(
+                statistics["setup_total"] + statistics["teardown_total"]
+            ),
+        )
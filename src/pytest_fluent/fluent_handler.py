@@ -0,0 +1,190 @@
+"""Fluent logging handlers and formatters of the logging extension."""
+
+import logging
+import time
+import typing
+
+from fluent import asyncsender
+from fluent.asynchandler import FluentHandler as AsyncFluentHandler
+from fluent.handler import FluentHandler, FluentRecordFormatter
+
+from .content_patcher import ContentPatcher
+from .event import is_event_loop_running, register_after_fork_reset
+from .log_buffer import LogBuffer
+from .plugin import get_context, get_session_uid
+
+
+class RecordFormatter(FluentRecordFormatter):
+    """Extension of FluentRecordFormatter in order to add unique ID's."""
+
+    def __init__(self, patcher: typing.Optional[ContentPatcher], *args, **kwargs):
+        """Specific initilization."""
+        super(RecordFormatter, self).__init__(*args, **kwargs)
+        self.content_patcher = patcher
+
+    def format(self, record):
+        """Extend formatting for Fluentd handler."""
+        data = super(RecordFormatter, self).format(record)
+
+        # Extend record by unique ids.
+        context = get_context()
+        data["sessionId"] = context.session_uid
+        data["testId"] = context.test_uid
+        data["stage"] = context.stage
+        if self.content_patcher:
+            data = self.content_patcher.patch(data, "logging", ["tag", "label"])
+        return data
+
+
+class BufferedFluentHandler(FluentHandler):
+    """Fluent handler which only ships the logging records of failed tests.
+
+    Records emitted during a testcase are kept in a bounded ring buffer per test
+    ID. They are either sent as one batch record or discarded once the test
+    finished. Records outside of a testcase are sent immediately.
+
+    Args:
+        tag (str): Fluent tag.
+        buffer_size (int): Maximum number of records buffered per test.
+        patcher (typing.Optional[ContentPatcher], optional): Patcher handler.
+            Defaults to None.
+        transport (str, optional): Send directly (blocking), from a background
+            thread (background) or from a background thread only within an
+            event loop (auto). Defaults to blocking.
+    """
+
+    def __init__(
+        self,
+        tag: str,
+        buffer_size: int,
+        patcher: typing.Optional[ContentPatcher] = None,
+        transport: str = "blocking",
+        **kwargs,
+    ):
+        """Specific initialization."""
+        # Set before the handler is registered for closing at shutdown
+        self.background_handler: typing.Optional[AsyncFluentHandler] = None
+        self._buffer = LogBuffer(buffer_size)
+        self._transport = transport
+        super(BufferedFluentHandler, self).__init__(tag, **kwargs)
+        self.content_patcher = patcher
+        if transport == "auto":
+            self.background_handler = AsyncFluentHandler(tag, **kwargs)
+
+    def getSenderClass(self):
+        """Get the sender class of the transport."""
+        if self._transport == "background":
+            return asyncsender.FluentSender
+        return super(BufferedFluentHandler, self).getSenderClass()
+
+    def setFormatter(self, fmt):
+        """Set the formatter for both senders."""
+        super(BufferedFluentHandler, self).setFormatter(fmt)
+        if self.background_handler is not None:
+            self.background_handler.setFormatter(fmt)
+
+    def _uses_background_handler(self) -> bool:
+        return self.background_handler is not None and is_event_loop_running()
+
+    def emit(self, record):
+        """Buffer testcase records instead of sending them."""
+        context = get_context()
+        if context.stage != "testcase" or context.test_uid is None:
+            if self._uses_background_handler():
+                return self.background_handler.emit(record)  # type: ignore
+            return super(BufferedFluentHandler, self).emit(record)
+        self._buffer.append(context.test_uid, self.format(record))
+
+    def ship(self, test_id: str) -> None:
+        """Send the buffered records of a test as one batch record.
+
+        Args:
+            test_id (str): Unique test identifier.
+        """
+        self.acquire()
+        try:
+            records, dropped = self._buffer.pop(test_id)
+        finally:
+            self.release()
+        if not records:
+            return
+        data: typing.Dict[str, typing.Any] = {
+            "type": "logging",
+            "stage": "testcase",
+            "sessionId": get_session_uid(),
+            "testId": test_id,
+            "records": records,
+        }
+        if dropped:
+            data["droppedRecords"] = dropped
+        if self.content_patcher:
+            data = self.content_patcher.patch(data, "logging", ["tag", "label"])
+        sender = (
+            self.background_handler.sender  # type: ignore
+            if self._uses_background_handler()
+            else self.sender
+        )
+        sender.emit_with_time(None, int(time.time()), data)
+
+    def discard(self, test_id: str) -> None:
+        """Drop the buffered records of a test.
+
+        Args:
+            test_id (str): Unique test identifier.
+        """
+        self.acquire()
+        try:
+            self._buffer.discard(test_id)
+        finally:
+            self.release()
+
+    def reset_after_fork(self) -> None:
+        """Drop the senders and the records buffered by the parent process.
+
+        Otherwise, a failing test of the child would ship the parent's records.
+        """
+        reset_handler_sender(self)
+        if self.background_handler is not None:
+            reset_handler_sender(self.background_handler)
+        self._buffer.clear()
+
+    def close(self):
+        """Close both senders."""
+        if self.background_handler is not None:
+            self.background_handler.close()
+        super(BufferedFluentHandler, self).close()
+
+
+class LoopAwareFluentHandler(FluentHandler):
+    """Fluent handler which does not block a running asyncio event loop.
+
+    Records emitted while an event loop is running in the current thread are
+    handed to a background sender thread, all other records are sent directly.
+    """
+
+    def __init__(self, tag: str, **kwargs):
+        """Specific initialization."""
+        super(LoopAwareFluentHandler, self).__init__(tag, **kwargs)
+        self.background_handler = AsyncFluentHandler(tag, **kwargs)
+        register_after_fork_reset(self.background_handler, reset_handler_sender)
+
+    def setFormatter(self, fmt):
+        """Set the formatter for both senders."""
+        super(LoopAwareFluentHandler, self).setFormatter(fmt)
+        self.background_handler.setFormatter(fmt)
+
+    def emit(self, record):
+        """Send record without blocking a running event loop."""
+        if is_event_loop_running():
+            return self.background_handler.emit(record)
+        return super(LoopAwareFluentHandler, self).emit(record)
+
+    def close(self):
+        """Close both senders."""
+        self.background_handler.close()
+        super(LoopAwareFluentHandler, self).close()
+
+
+def reset_handler_sender(handler: logging.Handler) -> None:
+    """Drop the sender of a Fluent handler, it is created again on first use."""
+    handler._sender = None  # type: ignore
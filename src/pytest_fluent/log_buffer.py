@@ -0,0 +1,66 @@
+"""Bounded per-test buffer for logging records."""
+
+import collections
+import typing
+
+
+class LogBuffer:
+    """Keep the latest logging records of each test in a bounded ring buffer.
+
+    Args:
+        max_records (int): Maximum number of records kept per test. Older
+            records are dropped once the limit is reached.
+    """
+
+    def __init__(self, max_records: int) -> None:
+        """Initialize log buffer."""
+        if max_records < 1:
+            raise ValueError("Log buffer size must be a positive integer.")
+        self._max_records = max_records
+        self._records: typing.Dict[str, typing.Deque[dict]] = {}
+        self._dropped: typing.Dict[str, int] = {}
+
+    def append(self, test_id: str, record: dict) -> None:
+        """Add a formatted record to the buffer of a test.
+
+        Args:
+            test_id (str): Unique test identifier.
+            record (dict): Formatted logging record.
+        """
+        records = self._records.get(test_id)
+        if records is None:
+            records = collections.deque(maxlen=self._max_records)
+            self._records[test_id] = records
+        if len(records) == self._max_records:
+            self._dropped[test_id] = self._dropped.get(test_id, 0) + 1
+        records.append(record)
+
+    def pop(self, test_id: str) -> typing.Tuple[typing.List[dict], int]:
+        """Remove and return the buffered records of a test.
+
+        Args:
+            test_id (str): Unique test identifier.
+
+        Returns:
+            typing.Tuple[typing.List[dict], int]: Buffered records and the number
+                of records dropped due to the buffer limit.
+        """
+        records = self._records.pop(test_id, None)
+        dropped = self._dropped.pop(test_id, 0)
+        if records is None:
+            return [], dropped
+        return list(records), dropped
+
+    def discard(self, test_id: str) -> None:
+        """Drop the buffered records of a test.
+
+        Args:
+            test_id (str): Unique test identifier.
+        """
+        self._records.pop(test_id, None)
+        self._dropped.pop(test_id, 0)
+
+    def clear(self) -> None:
+        """Drop the buffered records of all tests."""
+        self._records.clear()
+        self._dropped.clear()
@@ -1,6 +1,11 @@
 """pytest-fluent-logging plugin definition."""
 
+import collections
+import contextvars
 import datetime
+import functools
+import hashlib
+import importlib
 import logging
 import os
 import textwrap
@@ -9,20 +14,84 @@ import typing
 import uuid
 from io import BytesIO
 
-import msgpack
 import pytest
-from fluent.handler import FluentHandler, FluentRecordFormatter
 
 from pytest_fluent.importlib_utils import extract_function_from_module_string
 
 from .additional_information import get_additional_information_callback
+from .collection_telemetry import CollectionTelemetry
+from .consolidated_record import ConsolidatedRecord
 from .content_patcher import ContentPatcher
-from .event import Event
+from .feature_plugins import (
+    CollectionTelemetryPlugin,
+    FixtureTimingPlugin,
+    OrderByDurationPlugin,
+    RegressionsPlugin,
+    SlimReportsPlugin,
+)
+from .fixture_timing import FixtureStatistics, FixtureTimer
+from .regression import RegressionDetector
+from .resource_usage import ResourceMonitor
+from .rollup import Rollup
+from .sampling_profiler import SamplingProfiler
 from .setting_file_loader_action import (
     SettingFileLoaderAction,
-    load_and_check_settings_file,
+    load_default_settings,
+)
+from .shard import (
+    claim_merge,
+    merge_shard_summaries,
+    read_shard_summaries,
+    write_shard_summary,
 )
-from .test_report import LogReport
+from .test_report import (
+    MARKERS_KEY,
+    PRECOMPUTED_KEY,
+    TRACEBACK_FRAMES_KEY,
+    LogReport,
+)
+from .worker_telemetry import WorkerTelemetry, get_load_balance
+
+if typing.TYPE_CHECKING:
+    from .duration_store import DurationStore
+    from .event import Event
+
+# Attributes importing Fluent and msgpack, which are loaded on first access in
+# order to keep the plugin import cheap, see __getattr__.
+LAZY_ATTRIBUTES = {
+    "Event": ("pytest_fluent.event", "Event"),
+    "FluentHandler": ("fluent.handler", "FluentHandler"),
+    "FluentRecordFormatter": ("fluent.handler", "FluentRecordFormatter"),
+    "AsyncFluentHandler": ("fluent.asynchandler", "FluentHandler"),
+    "RecordFormatter": ("pytest_fluent.fluent_handler", "RecordFormatter"),
+    "BufferedFluentHandler": ("pytest_fluent.fluent_handler", "BufferedFluentHandler"),
+    "LoopAwareFluentHandler": (
+        "pytest_fluent.fluent_handler",
+        "LoopAwareFluentHandler",
+    ),
+    "reset_handler_sender": ("pytest_fluent.fluent_handler", "reset_handler_sender"),
+    "register_after_fork_reset": ("pytest_fluent.event", "register_after_fork_reset"),
+    "DurationStore": ("pytest_fluent.duration_store", "DurationStore"),
+    "order_by_duration": ("pytest_fluent.duration_store", "order_by_duration"),
+}
+
+
+def __getattr__(name: str) -> typing.Any:
+    """Import lazily loaded attributes on first access."""
+    if name not in LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module_name, attribute_name = LAZY_ATTRIBUTES[name]
+    attribute = getattr(importlib.import_module(module_name), attribute_name)
+    globals()[name] = attribute
+    return attribute
+
+
+def get_lazy_attribute(name: str) -> typing.Any:
+    """Get a lazily loaded attribute, which might have been replaced already."""
+    if name in globals():
+        return globals()[name]
+    return __getattr__(name)
+
 
 #####################################################
 # Plugin runtime
@@ -30,6 +99,20 @@ from .test_report import LogReport
 
 DOCSTRING_KEY = "docstring"
 DOCSTRING_STASHKEY = pytest.StashKey[str]()
+MARKER_NAMES_KEY = "marker_names"
+RESOURCE_USAGE_KEY = "resource_usage"
+FIXTURE_TIMING_KEY = "fixture_timing"
+PROFILE_KEY = "profile"
+FAILED_OUTCOMES = ["failed", "error"]
+SESSION_UUID_WORKERINPUT = "fluent_session_uuid"
+WORKER_TELEMETRY_WORKEROUTPUT = "fluent_worker_telemetry"
+CALL_DURATIONS_TABLE = "call_durations"
+TOP_REGRESSIONS = 10
+TRANSPORTS = ["blocking", "background", "auto"]
+MARKER_FORMATS = ["keywords", "names", "args"]
+FAILURE_DETAILS = ["crash", "short", "full"]
+FIXTURE_TIMINGS = ["test", "session"]
+ENABLED_ENV = "PYTEST_FLUENTD_ENABLED"
 
 
 class FluentLoggerRuntime(object):
@@ -41,23 +124,46 @@ class FluentLoggerRuntime(object):
 
     def __init__(self, config):
         """Initialize fluent-logger runtime."""
+        self._validate_options(config)
         self._session_uuid = None
         self._session_start_time = None
         self._test_uuid = None
         self.config = config
-        self._set_session_uid(self.config.getoption("--session-uuid"))
+        session_uuid = self.config.getoption("--session-uuid")
+        if session_uuid is None and hasattr(config, "workerinput"):
+            # Share the session ID of the pytest-xdist controller
+            session_uuid = config.workerinput.get(SESSION_UUID_WORKERINPUT)
+        self._set_session_uid(session_uuid)
         self._host = config.getoption("--fluentd-host")
         self._port = config.getoption("--fluentd-port")
         self._tag = config.getoption("--fluentd-tag")
         self._label = config.getoption("--fluentd-label")
         self._timestamp = config.getoption("--fluentd-timestamp")
+        self._transport = config.getoption("--fluentd-transport")
         self._extend_logging = config.getoption("--extend-logging")
         self._add_docstrings = config.getoption("--add-docstrings")
+        self._log_on_failure = config.getoption("--log-on-failure")
+        self._log_buffer_size = config.getoption("--log-buffer-size")
+        self._deduplicate_failures = config.getoption("--deduplicate-failures")
+        self._failure_hashes: typing.Set[str] = set()
+        self._structured_traceback = config.getoption("--structured-traceback")
+        self._intern_traceback_paths = config.getoption("--intern-traceback-paths")
+        self._file_indices: typing.Dict[str, int] = {}
+        self._marker_format = config.getoption("--marker-format")
+        self._markers: typing.Dict[typing.Tuple[str, bool], list] = {}
+        self._single_test_record = config.getoption("--single-test-record")
+        self._test_records: typing.Dict[str, ConsolidatedRecord] = {}
+        self._rollup: typing.Optional[Rollup] = (
+            Rollup() if config.getoption("--rollup") else None
+        )
+        self._rollup_failures = config.getoption("--rollup-failures")
+        self._log_handlers: typing.List[logging.Handler] = []
+        self._test_failed = False
         self.item: typing.Optional[pytest.Item] = None
         stage_names = [method for method in dir(self) if method.startswith("pytest_")]
         stage_names.append("logging")
         self._content_patcher = ContentPatcher(
-            user_settings=config.getoption("--stage-settings"),
+            user_settings=get_stage_settings(config),
             args_settings=config.option,
             stage_names=stage_names,
         )
@@ -67,13 +173,151 @@ class FluentLoggerRuntime(object):
             if not tag:
                 continue
             tags.append(tag)
-        tags = list(set(tags))
-        self._event = Event(
-            tags, self._host, self._port, buffer_overflow_handler=overflow_handler
+        self._tags = list(set(tags))
+        self._event: typing.Optional["Event"] = None
+        dropped_keys = self._content_patcher.get_dropped_keys(
+            "pytest_runtest_logreport"
+        )
+        if DOCSTRING_KEY in dropped_keys:
+            self._add_docstrings = False
+        if MARKERS_KEY in dropped_keys:
+            self._marker_format = "keywords"
+        self._log_reporter = LogReport(self.config, dropped_keys=dropped_keys)
+        self._emit_from_workers = config.getoption("--emit-from-workers")
+        worker_id = self._log_reporter.get_worker_id()
+        self._is_controller = worker_id == "master"
+        self._is_worker = worker_id not in ["master", "default"]
+        self._worker_information: typing.Dict[str, str] = (
+            {"workerId": worker_id}
+            if self._emit_from_workers and self._is_worker
+            else {}
+        )
+        self._slim_xdist_reports = (
+            config.getoption("--slim-xdist-reports") and not self._emit_from_workers
+        )
+        self._worker_telemetry: typing.Optional[WorkerTelemetry] = None
+        if config.getoption("--worker-telemetry") and self._is_worker:
+            self._worker_telemetry = WorkerTelemetry()
+        self._workers: typing.Dict[str, dict] = {}
+        self._shard_index = config.getoption("--shard-index")
+        self._shard_count = config.getoption("--shard-count")
+        self._shard_dir = config.getoption("--shard-dir")
+        self._shard_information: typing.Dict[str, int] = (
+            {"shardIndex": self._shard_index, "shardCount": self._shard_count}
+            if self._shard_count is not None
+            else {}
         )
-        self._log_reporter = LogReport(self.config)
+        self._outcomes: typing.Counter[str] = collections.Counter()
+        duration_store_path = config.getoption("--duration-store")
+        self._order_by_duration = config.getoption("--order-by-duration")
+        self._duration_store: typing.Optional["DurationStore"] = (
+            None
+            if duration_store_path is None
+            else get_lazy_attribute("DurationStore")(duration_store_path)
+        )
+        self._durations: typing.Dict[str, float] = {}
+        self._call_durations: typing.Dict[str, float] = {}
+        self._resource_monitor: typing.Optional[ResourceMonitor] = (
+            ResourceMonitor() if config.getoption("--resource-usage") else None
+        )
+        self._fixture_timing = config.getoption("--fixture-timing")
+        self._fixture_statistics: typing.Optional[FixtureStatistics] = (
+            FixtureStatistics() if self._fixture_timing == "session" else None
+        )
+        self._test_fixture_timings: typing.Dict[str, typing.List[dict]] = {}
+        self._profile_threshold = config.getoption("--profile-slow-tests")
+        self._profiler: typing.Optional[SamplingProfiler] = (
+            None
+            if self._profile_threshold is None
+            else SamplingProfiler(config.getoption("--profile-interval"))
+        )
+        self._call_duration_store: typing.Optional["DurationStore"] = None
+        self._regression_detector: typing.Optional[RegressionDetector] = None
+        self.fixture_timer: typing.Optional[FixtureTimer] = None
+        self.collection_telemetry: typing.Optional[CollectionTelemetry] = None
+        self.feature_plugins = self._create_feature_plugins(config)
         self._patch_logging()
 
+    @staticmethod
+    def _validate_options(config) -> None:
+        """Check the options which depend on or restrict each other."""
+        if config.getoption("--log-on-failure") and not config.getoption(
+            "--extend-logging"
+        ):
+            raise pytest.UsageError("--log-on-failure requires --extend-logging.")
+        if config.getoption("--log-buffer-size") < 1:
+            raise pytest.UsageError("--log-buffer-size must be at least 1.")
+        if config.getoption("--intern-traceback-paths") and not config.getoption(
+            "--structured-traceback"
+        ):
+            raise pytest.UsageError(
+                "--intern-traceback-paths requires --structured-traceback."
+            )
+        if config.getoption("--rollup-failures") and not config.getoption("--rollup"):
+            raise pytest.UsageError("--rollup-failures requires --rollup.")
+        shard_index = config.getoption("--shard-index")
+        shard_count = config.getoption("--shard-count")
+        if (shard_index is None) != (shard_count is None):
+            raise pytest.UsageError(
+                "--shard-index and --shard-count must be used together."
+            )
+        if shard_count is not None and not 0 <= shard_index < shard_count:
+            raise pytest.UsageError(
+                "--shard-index must be between 0 and --shard-count minus one."
+            )
+        if config.getoption("--shard-dir") is not None and shard_count is None:
+            raise pytest.UsageError(
+                "--shard-dir requires --shard-index and --shard-count."
+            )
+        if config.getoption("--duration-store") is None:
+            if config.getoption("--order-by-duration"):
+                raise pytest.UsageError(
+                    "--order-by-duration requires --duration-store."
+                )
+            if config.getoption("--detect-regressions"):
+                raise pytest.UsageError(
+                    "--detect-regressions requires --duration-store."
+                )
+        for option in [
+            "--captured-output-max-size",
+            "--captured-output-chunk-size",
+            "--failure-message-max-size",
+        ]:
+            if config.getoption(option) < 0:
+                raise pytest.UsageError(f"{option} must not be negative.")
+        if config.getoption("--profile-interval") <= 0:
+            raise pytest.UsageError("--profile-interval must be positive.")
+
+    def _create_feature_plugins(self, config) -> typing.Dict[str, typing.Any]:
+        """Set up the features with own hooks and create their plugins.
+
+        See feature_plugins for the plugins.
+        """
+        plugins: typing.Dict[str, typing.Any] = {}
+        if self._slim_xdist_reports and self._is_worker:
+            plugins["fluent-slim-reports"] = SlimReportsPlugin(self)
+        if self._order_by_duration:
+            plugins["fluent-order-by-duration"] = OrderByDurationPlugin(self)
+        if config.getoption("--detect-regressions"):
+            self._call_duration_store = get_lazy_attribute("DurationStore")(
+                config.getoption("--duration-store"), table=CALL_DURATIONS_TABLE
+            )
+            self._regression_detector = RegressionDetector(
+                self._call_duration_store.load(),
+                config.getoption("--regression-threshold"),
+                config.getoption("--regression-min-delta"),
+            )
+            plugins["fluent-regressions"] = RegressionsPlugin(self)
+        if self._fixture_timing is not None:
+            self.fixture_timer = FixtureTimer()
+            plugins["fluent-fixture-timing"] = FixtureTimingPlugin(self.fixture_timer)
+        if config.getoption("--collection-telemetry"):
+            self.collection_telemetry = CollectionTelemetry()
+            plugins["fluent-collection-telemetry"] = CollectionTelemetryPlugin(
+                self, self.collection_telemetry
+            )
+        return plugins
+
     def _patch_logging(self):
         if not self._extend_logging:
             return
@@ -86,7 +330,309 @@ class FluentLoggerRuntime(object):
         label = self._content_patcher.user_settings.get("logging", {}).get("label")
         if label:
             tag = f"{tag}.{label}"
-        extend_loggers(self._host, self._port, tag, self._content_patcher)
+        self._log_handlers = extend_loggers(
+            self._host,
+            self._port,
+            tag,
+            self._content_patcher,
+            buffer_size=self._log_buffer_size if self._log_on_failure else None,
+            transport=self._transport,
+        )
+
+    @property
+    def event(self) -> "Event":
+        """Get the event sender, which is created on first use."""
+        if self._event is None:
+            self._event = get_lazy_attribute("Event")(
+                self._tags,
+                self._host,
+                self._port,
+                background=self._transport == "background",
+                buffer_overflow_handler=overflow_handler,
+            )
+        return typing.cast("Event", self._event)
+
+    def close(self):
+        """Remove logging handlers and flush background senders."""
+        self._unpatch_logging()
+        if self._profiler is not None:
+            self._profiler.close()
+        if self._event is not None:
+            self._event.close()
+
+    def _unpatch_logging(self):
+        for handler in self._log_handlers:
+            for name in [None, "fluent"]:
+                logging.getLogger(name).removeHandler(handler)
+            handler.close()
+        self._log_handlers = []
+
+    def _ship_buffered_logs(self):
+        """Ship the buffered logging records of failed tests, drop the others."""
+        for handler in self._log_handlers:
+            if not isinstance(handler, get_lazy_attribute("BufferedFluentHandler")):
+                continue
+            if self._test_failed:
+                handler.ship(self.test_uid)
+            else:
+                handler.discard(self.test_uid)
+
+    def slim_serialized_report(self, report: pytest.TestReport, data: dict) -> None:
+        """Reduce a report serialized by a pytest-xdist worker.
+
+        The report data are precomputed by the worker, so the stash entries
+        used for their computation and the node keywords are not transferred
+        to the controller.
+        """
+        if not self._slim_xdist_reports or not self._is_worker:
+            return
+        if not isinstance(report, pytest.TestReport):
+            return
+        stash = data.get("stash") or {}
+        slim_stash = {
+            key: stash[key]
+            for key in [
+                DOCSTRING_KEY,
+                MARKER_NAMES_KEY,
+                RESOURCE_USAGE_KEY,
+                FIXTURE_TIMING_KEY,
+                PROFILE_KEY,
+            ]
+            if stash.get(key) is not None
+        }
+        slim_stash[PRECOMPUTED_KEY] = self._log_reporter.get_report_data(report)
+        data["stash"] = slim_stash
+        data["keywords"] = {}
+
+    def order_items(self, items: typing.List[pytest.Item]) -> None:
+        """Order the test items by their stored duration, longest first.
+
+        The scheduler of pytest-xdist distributes the tests in this order, so
+        long tests are not started at the end of the session.
+        """
+        if not self._order_by_duration:
+            return
+        durations = typing.cast("DurationStore", self._duration_store).load()
+        items[:] = get_lazy_attribute("order_by_duration")(items, durations)
+
+    def report_regressions(self, terminalreporter) -> None:
+        """Write the largest duration regressions to the terminal summary."""
+        if self._regression_detector is None:
+            return
+        regressions = self._regression_detector.get_top(TOP_REGRESSIONS)
+        if not regressions:
+            return
+        terminalreporter.write_sep("=", "duration regressions")
+        for regression in regressions:
+            terminalreporter.write_line(
+                f"{regression.duration:.3f}s (baseline {regression.baseline:.3f}s, "
+                f"{regression.ratio:.1f}x) {regression.nodeid}"
+            )
+
+    def _merge_shards(self, duration: float) -> None:
+        """Share the shard summary and send the session summary of all shards.
+
+        The summary is sent by the shard which finishes last.
+        """
+        summary = {
+            "tests": sum(self._outcomes.values()),
+            "outcomes": dict(self._outcomes),
+            "duration": duration,
+            "rollup": None if self._rollup is None else self._rollup.to_state(),
+        }
+        write_shard_summary(
+            self._shard_dir, self.session_uid, self._shard_index, summary
+        )
+        summaries = read_shard_summaries(
+            self._shard_dir, self.session_uid, self._shard_count
+        )
+        if summaries is None or not claim_merge(self._shard_dir, self.session_uid):
+            return
+        self._emit_session_record(
+            "session_summary",
+            {"shardCount": self._shard_count, **merge_shard_summaries(summaries)},
+        )
+
+    def _emit_session_record(
+        self,
+        record_type: str,
+        record: dict,
+        stage_name: str = "pytest_sessionfinish",
+    ) -> None:
+        """Send a record of the session, patched with the settings of a stage.
+
+        Args:
+            record_type (str): Type of the record, e.g. "rollup".
+            record (dict): Content of the record.
+            stage_name (str): Stage whose settings patch the record.
+        """
+        data = {
+            "type": record_type,
+            "stage": "session",
+            "sessionId": self.session_uid,
+            **record,
+        }
+        self._set_timestamp_information(data=data)
+        data = self._content_patcher.patch(data, stage_name=stage_name)
+        tag, label = self._content_patcher.get_tag_and_label(stage_name)
+        self.event(tag, label, data)
+
+    def add_worker_telemetry(self, worker_id: str, telemetry: dict) -> None:
+        """Store the telemetry summary of a finished pytest-xdist worker."""
+        self._workers[worker_id] = telemetry
+
+    def _send_worker_telemetry(self) -> None:
+        """Send the telemetry of each worker and the load balance."""
+        for worker_id, telemetry in sorted(self._workers.items()):
+            self._emit_session_record("worker", {"workerId": worker_id, **telemetry})
+        self._emit_session_record("load_balance", get_load_balance(self._workers))
+
+    def _skip_session_events(self) -> bool:
+        """Check if session events are left to the pytest-xdist controller."""
+        return self._emit_from_workers and self._is_worker
+
+    def _skip_testcase_events(self) -> bool:
+        """Check if testcase events are left to the pytest-xdist workers."""
+        return self._emit_from_workers and self._is_controller
+
+    def _get_markers(self, item: pytest.Item, with_args: bool) -> list:
+        """Get the markers of a test item, extracted once per item."""
+        key = (item.nodeid, with_args)
+        markers = self._markers.get(key)
+        if markers is None:
+            markers = get_markers(item, with_args=with_args)
+            self._markers[key] = markers
+        return markers
+
+    def _add_outcome(self, report: pytest.TestReport, outcome: str) -> None:
+        """Count the outcome of a report and add it to the rollup."""
+        self._outcomes[outcome] += 1
+        if self._rollup is not None:
+            stash = getattr(report, "stash", None) or {}
+            self._rollup.add(
+                report.nodeid,
+                stash.get(MARKER_NAMES_KEY, []),
+                outcome,
+                report.duration,
+            )
+
+    def _is_rolled_up(self, outcome: typing.Optional[str]) -> bool:
+        """Check if the per-test messages of an outcome are only rolled up."""
+        if self._rollup is None:
+            return False
+        return not (self._rollup_failures and outcome in FAILED_OUTCOMES)
+
+    def _get_item(self, nodeid: str) -> typing.Optional[pytest.Item]:
+        """Get the running test item if it matches the node ID."""
+        if self.item is None or self.item.nodeid != nodeid:
+            return None
+        return self.item
+
+    def _send_test_record(self, nodeid: str) -> None:
+        """Send the consolidated record of a finished test."""
+        test_record = self._test_records.pop(nodeid, None)
+        # Workers of pytest-xdist do not report outcomes, see LogReport
+        if test_record is None or not test_record.has_outcome:
+            return
+        if self._is_rolled_up(test_record.data.get("outcome")):
+            return
+        data = test_record.finish()
+        self._set_timestamp_information(data=data)
+        stage_name = "pytest_runtest_logreport"
+        data = self._content_patcher.patch(data, stage_name=stage_name)
+        data.update(test_record.additional_information)
+        data.update(
+            get_additional_information_callback(stage="pytest_runtest_logfinish")
+        )
+        tag, label = self._content_patcher.get_tag_and_label(stage_name)
+        self.event(tag, label, data)
+
+    def _send_rollup(self) -> None:
+        """Send the aggregated test results of the session."""
+        for record in typing.cast(Rollup, self._rollup).to_records():
+            self._emit_session_record("rollup", {**self._shard_information, **record})
+
+    def _add_fixture_timings(self, nodeid: str, timings: typing.List[dict]) -> None:
+        """Keep the fixture times of a test for its finish event or statistics."""
+        if self._fixture_statistics is None:
+            # The finish events are sent by the workers
+            if not self._skip_testcase_events():
+                self._test_fixture_timings[nodeid] = timings
+        elif not self._is_worker:
+            self._fixture_statistics.add(timings)
+
+    def _send_fixture_statistics(self) -> None:
+        """Send the aggregated fixture times of the session."""
+        for record in typing.cast(
+            FixtureStatistics, self._fixture_statistics
+        ).to_records():
+            self._emit_session_record("fixture", {**self._shard_information, **record})
+
+    def send_collection_telemetry(self, items: int) -> None:
+        """Send the collection telemetry in a single record.
+
+        Each pytest-xdist worker collects the tests itself, so the workers
+        send their collection telemetry, while the controller collects nothing.
+        """
+        collection_telemetry = self.collection_telemetry
+        if collection_telemetry is None or not collection_telemetry.modules:
+            return
+        if self.config.getoption("collectonly"):
+            return
+        self._emit_session_record(
+            "collection",
+            {
+                **self._shard_information,
+                **self._worker_information,
+                **collection_telemetry.to_dict(items),
+            },
+            stage_name="pytest_sessionstart",
+        )
+
+    def _send_failure_message(self, data: dict) -> None:
+        """Replace the failure message by its hash and send each message once."""
+        message = data.pop("failure_message")
+        failure_hash = hashlib.sha256(message.encode("utf-8")).hexdigest()
+        data.update({"failure_hash": failure_hash})
+        if failure_hash in self._failure_hashes:
+            return
+        self._failure_hashes.add(failure_hash)
+        failure = {
+            "type": "failure",
+            "stage": "testcase",
+            "sessionId": self.session_uid,
+            "failure_hash": failure_hash,
+            "failure_message": message,
+        }
+        self._set_timestamp_information(data=failure)
+        stage_name = "pytest_runtest_logreport"
+        failure = self._content_patcher.patch(failure, stage_name=stage_name)
+        tag, label = self._content_patcher.get_tag_and_label(stage_name)
+        self.event(tag, label, failure)
+
+    def _intern_file_paths(self, frames: typing.List[dict]) -> None:
+        """Replace the frame file paths by indices and send each path once."""
+        for frame in frames:
+            path = frame["file"]
+            file_index = self._file_indices.get(path)
+            if file_index is None:
+                file_index = len(self._file_indices)
+                self._file_indices[path] = file_index
+                file_data = {
+                    "type": "file",
+                    "stage": "testcase",
+                    "sessionId": self.session_uid,
+                    "file_index": file_index,
+                    "file": path,
+                }
+                self._set_timestamp_information(data=file_data)
+                stage_name = "pytest_runtest_logreport"
+                file_data = self._content_patcher.patch(
+                    file_data, stage_name=stage_name
+                )
+                tag, label = self._content_patcher.get_tag_and_label(stage_name)
+                self.event(tag, label, file_data)
+            frame["file"] = file_index
 
     def _set_session_uid(
         self, id: typing.Optional[typing.Union[str, uuid.UUID]] = None
@@ -126,16 +672,19 @@ class FluentLoggerRuntime(object):
         set_stage("session")
         self._session_start_time = time.time()
         if not self.config.getoption("collectonly"):
+            if self._skip_session_events():
+                return
             data = {
                 "status": "start",
                 "stage": "session",
                 "sessionId": self.session_uid,
+                **self._shard_information,
             }
             data = self._content_patcher.patch(data)
             data.update(get_additional_information_callback())
             self._set_timestamp_information(data=data)
             tag, label = self._content_patcher.get_tag_and_label()
-            self._event(tag, label, data)
+            self.event(tag, label, data)
 
     def pytest_runtest_protocol(self, item: pytest.Item, nextitem: pytest.Item):
         """Customize hook for a protocol start."""
@@ -145,41 +694,58 @@ class FluentLoggerRuntime(object):
         """Customize hook for test start."""
         set_stage("testcase")
         if not self.config.getoption("collectonly"):
+            if self._worker_telemetry is not None:
+                self._worker_telemetry.start_test()
+            if self._skip_testcase_events():
+                return
             self._create_test_unique_identifier()
+            update_context()
+            self._test_failed = False
+            if self._single_test_record:
+                self._test_records[nodeid] = ConsolidatedRecord(
+                    {
+                        "stage": "testcase",
+                        "sessionId": self.session_uid,
+                        "testId": self.test_uid,
+                        "name": nodeid,
+                        **self._worker_information,
+                    },
+                    get_additional_information_callback(
+                        item=self._get_item(nodeid), stage="pytest_runtest_logstart"
+                    ),
+                )
+                return
+            if self._rollup is not None:
+                return
             data = {
                 "status": "start",
                 "stage": "testcase",
                 "sessionId": self.session_uid,
                 "testId": self.test_uid,
                 "name": nodeid,
+                **self._worker_information,
             }
             data = self._content_patcher.patch(data)
             data.update(
-                get_additional_information_callback(
-                    item=(
-                        None
-                        if self.item is None or self.item.nodeid != nodeid
-                        else self.item
-                    )
-                )
+                get_additional_information_callback(item=self._get_item(nodeid))
             )
             self._set_timestamp_information(data=data)
             tag, label = self._content_patcher.get_tag_and_label()
-            self._event(tag, label, data)
+            self.event(tag, label, data)
 
     def pytest_runtest_setup(self, item: pytest.Item):
         """Customize hook for test setup."""
         set_stage("testcase")
-        docstring = get_test_docstring(item)
-        item.stash[DOCSTRING_STASHKEY] = docstring
+        if self._add_docstrings:
+            item.stash[DOCSTRING_STASHKEY] = get_test_docstring(item)
         if not self.config.getoption("collectonly"):
             pass
 
     def pytest_runtest_teardown(self, item: pytest.Item, nextitem: pytest.Item):
         """Customize hook for test teardown."""
         set_stage("testcase")
-        docstring = get_test_docstring(item)
-        item.stash[DOCSTRING_STASHKEY] = docstring
+        if self._add_docstrings:
+            item.stash[DOCSTRING_STASHKEY] = get_test_docstring(item)
         if not self.config.getoption("collectonly"):
             pass
 
@@ -187,47 +753,129 @@ class FluentLoggerRuntime(object):
         """Customize hook for test call."""
         set_stage("testcase")
         if not self.config.getoption("collectonly"):
-            pass
+            if self._resource_monitor is not None:
+                self._resource_monitor.start()
+            if self._profiler is not None:
+                self._profiler.start()
 
     @pytest.hookimpl(hookwrapper=True)
     def pytest_runtest_makereport(self, item: pytest.Item, call):
         """Customize hook for make report."""
+        # Stop measuring before the report, e.g. its traceback, is created
+        resource_usage = (
+            self._resource_monitor.stop()
+            if self._resource_monitor is not None and call.when == "call"
+            else None
+        )
+        samples = (
+            self._profiler.stop()
+            if self._profiler is not None and call.when == "call"
+            else None
+        )
         report = (yield).get_result()
         docstring = item.stash.get(DOCSTRING_STASHKEY, None)
         report.stash = {DOCSTRING_KEY: docstring}
+        if resource_usage is not None:
+            report.stash[RESOURCE_USAGE_KEY] = resource_usage
+        # The samples of fast tests are discarded
+        if samples is not None and call.duration >= self._profile_threshold:
+            report.stash[PROFILE_KEY] = typing.cast(
+                SamplingProfiler, self._profiler
+            ).to_profile(samples)
+        if self.fixture_timer is not None and call.when == "teardown":
+            report.stash[FIXTURE_TIMING_KEY] = self.fixture_timer.pop_timings()
+        if self._marker_format != "keywords":
+            report.stash[MARKERS_KEY] = self._get_markers(
+                item, with_args=self._marker_format == "args"
+            )
+        if self._rollup is not None:
+            report.stash[MARKER_NAMES_KEY] = self._get_markers(item, with_args=False)
+        if self._structured_traceback and call.excinfo is not None:
+            report.stash[TRACEBACK_FRAMES_KEY] = LogReport.extract_traceback_frames(
+                call.excinfo, str(self.config.invocation_params.dir)
+            )
 
     def pytest_runtest_logreport(self, report: pytest.TestReport):
         """Customize hook for logging results."""
         set_stage("testcase")
         if not self.config.getoption("collectonly"):
+            if self._duration_store is not None and not self._is_worker:
+                self._durations[report.nodeid] = (
+                    self._durations.get(report.nodeid, 0.0) + report.duration
+                )
+            if (
+                self._regression_detector is not None
+                and not self._is_worker
+                and report.when == "call"
+                and report.passed
+            ):
+                self._call_durations[report.nodeid] = report.duration
+                self._regression_detector.check(report.nodeid, report.duration)
+            if self._fixture_timing is not None and report.when == "teardown":
+                self._add_fixture_timings(
+                    report.nodeid, report.stash.get(FIXTURE_TIMING_KEY, [])
+                )
+            if self._skip_testcase_events():
+                # The controller still summarizes the results of all workers
+                if self._rollup is not None or self._shard_dir is not None:
+                    outcome = self._log_reporter.get_report_data(report).get("outcome")
+                    if outcome is not None:
+                        self._add_outcome(report, outcome)
+                return
+            if report.failed:
+                self._test_failed = True
             data = self._log_reporter(report)
+            test_record = self._test_records.get(report.nodeid)
+            if test_record is not None:
+                test_record.add_duration(report.when, report.duration)
             if not data:
                 return
+            self._add_outcome(report, data["outcome"])
+            if test_record is None and self._is_rolled_up(data["outcome"]):
+                return
             data.update(
                 {
                     "stage": "testcase",
                     "when": report.when,
                     "sessionId": self.session_uid,
                     "testId": self.test_uid,
+                    **self._worker_information,
                 }
             )
+            if self._regression_detector is not None and report.when == "call":
+                data.update(
+                    self._regression_detector.get_fields(report.nodeid, report.duration)
+                )
             if self._add_docstrings:
                 docstring = report.stash.get(DOCSTRING_KEY, None)
                 if docstring:
                     data.update({"docstring": docstring})
+            resource_usage = report.stash.get(RESOURCE_USAGE_KEY)
+            if resource_usage is not None:
+                data.update({"resourceUsage": resource_usage})
+            profile = report.stash.get(PROFILE_KEY)
+            if profile is not None:
+                data.update({"profile": profile})
+            if self._deduplicate_failures and "failure_message" in data:
+                self._send_failure_message(data)
+            if self._intern_traceback_paths and "traceback" in data:
+                self._intern_file_paths(data["traceback"])
+            if test_record is not None:
+                test_record.update(
+                    data,
+                    get_additional_information_callback(
+                        item=self._get_item(report.nodeid),
+                        stage="pytest_runtest_logreport",
+                    ),
+                )
+                return
             self._set_timestamp_information(data=data)
             data = self._content_patcher.patch(data)
             data.update(
-                get_additional_information_callback(
-                    item=(
-                        None
-                        if self.item is None or self.item.nodeid != report.nodeid
-                        else self.item
-                    )
-                )
+                get_additional_information_callback(item=self._get_item(report.nodeid))
             )
             tag, label = self._content_patcher.get_tag_and_label()
-            self._event(tag, label, data)
+            self.event(tag, label, data)
 
     def pytest_runtest_logfinish(
         self,
@@ -237,18 +885,35 @@ class FluentLoggerRuntime(object):
         """Customize hook for test end."""
         set_stage("testcase")
         if not self.config.getoption("collectonly"):
-            data = {
+            if self._worker_telemetry is not None:
+                self._worker_telemetry.finish_test()
+            if self._skip_testcase_events():
+                return
+            self._ship_buffered_logs()
+            fixtures = self._test_fixture_timings.pop(nodeid, None)
+            if self._single_test_record:
+                test_record = self._test_records.get(nodeid)
+                if test_record is not None and fixtures is not None:
+                    test_record.data["fixtures"] = fixtures
+                self._send_test_record(nodeid)
+                return
+            if self._rollup is not None:
+                return
+            data: typing.Dict[str, typing.Any] = {
                 "status": "finish",
                 "stage": "testcase",
                 "sessionId": self.session_uid,
                 "testId": self.test_uid,
                 "name": nodeid,
+                **self._worker_information,
             }
+            if fixtures is not None:
+                data["fixtures"] = fixtures
             self._set_timestamp_information(data=data)
             data = self._content_patcher.patch(data)
             data.update(get_additional_information_callback())
             tag, label = self._content_patcher.get_tag_and_label()
-            self._event(tag, label, data)
+            self.event(tag, label, data)
 
     def pytest_sessionfinish(
         self,
@@ -258,28 +923,59 @@ class FluentLoggerRuntime(object):
         """Customize hook for session end."""
         set_stage("session")
         if not self.config.getoption("collectonly"):
+            if self._rollup is not None and not self._skip_session_events():
+                self._send_rollup()
+            if self._worker_telemetry is not None:
+                self.config.workeroutput[WORKER_TELEMETRY_WORKEROUTPUT] = (
+                    self._worker_telemetry.to_dict()
+                )
+            if self._workers:
+                self._send_worker_telemetry()
+            if (
+                self._fixture_statistics is not None
+                and self._fixture_statistics.fixtures
+            ):
+                self._send_fixture_statistics()
+            if self._duration_store is not None and self._durations:
+                self._duration_store.update(self._durations)
+            if self._call_duration_store is not None and self._call_durations:
+                self._call_duration_store.update(self._call_durations)
+            if self._skip_session_events():
+                return
+            duration = time.time() - (
+                0 if self._session_start_time is None else self._session_start_time
+            )
             data = {
                 "status": "finish",
-                "duration": (
-                    time.time()
-                    - (
-                        0
-                        if self._session_start_time is None
-                        else self._session_start_time
-                    )
-                ),
+                "duration": duration,
                 "stage": "session",
                 "sessionId": self.session_uid,
+                **self._shard_information,
             }
             self._set_timestamp_information(data=data)
             data = self._content_patcher.patch(data)
             data.update(get_additional_information_callback())
             tag, label = self._content_patcher.get_tag_and_label()
-            self._event(tag, label, data)
+            self.event(tag, label, data)
+            if self._shard_dir is not None and not self._is_worker:
+                self._merge_shards(duration)
+
+
+class FluentContext(typing.NamedTuple):
+    """Snapshot of the identifiers used to attribute records."""
+
+    session_uid: typing.Optional[str]
+    test_uid: typing.Optional[str]
+    stage: str
 
 
 STAGE: str = "session"
 FLUENT_RUNTIME: typing.Optional[FluentLoggerRuntime] = None
+# Context snapshot updated by the hooks. Asyncio tasks inherit it automatically,
+# threads fall back to the module globals unless bound with bind_context.
+FLUENT_CONTEXT: "contextvars.ContextVar[typing.Optional[FluentContext]]" = (
+    contextvars.ContextVar("pytest_fluent_context", default=None)
+)
 
 #####################################################
 # Setup
@@ -289,6 +985,22 @@ FLUENT_RUNTIME: typing.Optional[FluentLoggerRuntime] = None
 def pytest_addoption(parser):
     """Extend pytest addoption."""
     group = parser.getgroup("fluent-logging")
+    group.addoption(
+        "--fluentd-enable",
+        action="store_const",
+        const=True,
+        dest="fluentd_enabled",
+        default=None,
+        help="Enable the Fluentd logging, overrides the environment variable "
+        f"{ENABLED_ENV} and the ini option fluentd_enabled.",
+    )
+    group.addoption(
+        "--fluentd-disable",
+        action="store_const",
+        const=False,
+        dest="fluentd_enabled",
+        help="Disable the Fluentd logging, no runtime hooks are registered.",
+    )
     group.addoption(
         "--session-uuid",
         default=None,
@@ -321,33 +1033,249 @@ def pytest_addoption(parser):
         default=None,
         help="Custom Fluentd timestamp (default: %(default)s)",
     )
+    group.addoption(
+        "--fluentd-transport",
+        default="blocking",
+        choices=TRANSPORTS,
+        help="Send data by blocking the caller, from a background thread or "
+        "from a background thread only while an asyncio event loop is running "
+        "(default: %(default)s)",
+    )
     group.addoption(
         "--extend-logging",
         action="store_true",
         help="Extend the Python logging with a Fluent handler",
     )
+    group.addoption(
+        "--log-on-failure",
+        action="store_true",
+        help="Buffer the extended logging records of each test and only send them "
+        "as one batch if the test failed. Requires --extend-logging.",
+    )
+    group.addoption(
+        "--log-buffer-size",
+        default=1000,
+        type=int,
+        help="Maximum number of logging records buffered per test if "
+        "--log-on-failure is set (default: %(default)s)",
+    )
     group.addoption(
         "--add-docstrings",
         action="store_true",
         help="Add test docstrings to the testcase call messages.",
     )
+    group.addoption(
+        "--add-captured-output",
+        action="store_true",
+        help="Add the captured log, stdout and stderr sections to the testcase "
+        "report messages.",
+    )
+    group.addoption(
+        "--captured-output-max-size",
+        default=65536,
+        type=int,
+        help="Maximum size in bytes of each captured output section, 0 disables "
+        "the limit (default: %(default)s)",
+    )
+    group.addoption(
+        "--captured-output-chunk-size",
+        default=16384,
+        type=int,
+        help="Split captured output sections into chunks of this size in bytes, "
+        "0 disables chunking (default: %(default)s)",
+    )
+    group.addoption(
+        "--failure-detail",
+        default="full",
+        choices=FAILURE_DETAILS,
+        help="Detail level of the failure message, the crash line only ('crash'), "
+        "one line per traceback entry ('short') or the full rendered traceback "
+        "('full') (default: %(default)s)",
+    )
+    group.addoption(
+        "--failure-message-max-size",
+        default=0,
+        type=int,
+        help="Maximum size in bytes of the failure message, 0 disables the limit "
+        "(default: %(default)s)",
+    )
+    group.addoption(
+        "--deduplicate-failures",
+        action="store_true",
+        help="Send each distinct failure message only once as a separate record "
+        "and reference it by its SHA-256 hash in the testcase report messages.",
+    )
+    group.addoption(
+        "--structured-traceback",
+        action="store_true",
+        help="Add the failure traceback frames with file, line, function and "
+        "exception type to the testcase report messages.",
+    )
+    group.addoption(
+        "--intern-traceback-paths",
+        action="store_true",
+        help="Send each traceback file path only once as a separate record and "
+        "reference it by an index in the traceback frames. Requires "
+        "--structured-traceback.",
+    )
+    group.addoption(
+        "--marker-format",
+        default="keywords",
+        choices=MARKER_FORMATS,
+        help="Format of the testcase markers, the keywords of the test node "
+        "('keywords'), the marker names ('names') or the marker names with their "
+        "arguments ('args') (default: %(default)s)",
+    )
+    group.addoption(
+        "--single-test-record",
+        action="store_true",
+        help="Send a single record per test at its end, containing the start and "
+        "finish time, phase durations, outcome and report data, instead of the "
+        "testcase start, report and finish messages.",
+    )
+    group.addoption(
+        "--rollup",
+        action="store_true",
+        help="Do not send per-test messages, but the outcome counts and duration "
+        "histograms per module and marker at the end of the session.",
+    )
+    group.addoption(
+        "--rollup-failures",
+        action="store_true",
+        help="Send the report messages of failed tests in addition to the "
+        "rollup. Requires --rollup.",
+    )
+    group.addoption(
+        "--emit-from-workers",
+        action="store_true",
+        help="Send the testcase messages directly from the pytest-xdist workers "
+        "tagged with the worker ID, the controller only sends session messages.",
+    )
+    group.addoption(
+        "--slim-xdist-reports",
+        action="store_true",
+        help="Compute the report messages on the pytest-xdist workers and "
+        "transfer them to the controller instead of the node keywords and the "
+        "data needed for their computation.",
+    )
+    group.addoption(
+        "--worker-telemetry",
+        action="store_true",
+        help="Send the busy and idle time, executed tests and queue waits of each "
+        "pytest-xdist worker and the load balance at the end of the session.",
+    )
+    group.addoption(
+        "--shard-index",
+        type=int,
+        default=None,
+        help="Index of this shard, if a session with the same --session-uuid is "
+        "split into shards, e.g. on several machines. Requires --shard-count.",
+    )
+    group.addoption(
+        "--shard-count",
+        type=int,
+        default=None,
+        help="Number of shards of the session. Requires --shard-index.",
+    )
+    group.addoption(
+        "--shard-dir",
+        type=str,
+        default=None,
+        help="Directory shared by all shards. The last finishing shard merges "
+        "the shard summaries and sends a session summary.",
+    )
+    group.addoption(
+        "--duration-store",
+        type=str,
+        default=None,
+        help="SQLite file storing the smoothed duration of each test, which is "
+        "updated at the end of each session.",
+    )
+    group.addoption(
+        "--order-by-duration",
+        action="store_true",
+        help="Run the tests ordered by their stored duration, longest first. "
+        "Requires --duration-store.",
+    )
+    group.addoption(
+        "--detect-regressions",
+        action="store_true",
+        help="Compare the call duration of each test against its baseline "
+        "smoothed over the previous runs. Requires --duration-store.",
+    )
+    group.addoption(
+        "--regression-threshold",
+        type=float,
+        default=1.5,
+        help="Minimum ratio of call duration and baseline of a regression.",
+    )
+    group.addoption(
+        "--regression-min-delta",
+        type=float,
+        default=0.1,
+        help="Minimum difference of call duration and baseline of a regression "
+        "in seconds, which ignores the jitter of short tests.",
+    )
+    group.addoption(
+        "--resource-usage",
+        action="store_true",
+        help="Add the CPU times, peak memory growth, context switches and "
+        "garbage collections of each test call to its call event.",
+    )
+    group.addoption(
+        "--fixture-timing",
+        choices=FIXTURE_TIMINGS,
+        default=None,
+        help="Measure the setup and teardown time of each fixture and add them "
+        "to the finish event of each test or send aggregated statistics per "
+        "fixture at the session end.",
+    )
+    group.addoption(
+        "--profile-slow-tests",
+        type=float,
+        default=None,
+        help="Sample the stack of each test call and add the most frequent "
+        "stacks to the call event of tests running longer than the given "
+        "seconds.",
+    )
+    group.addoption(
+        "--profile-interval",
+        type=float,
+        default=0.005,
+        help="Sampling interval of the profiler in seconds.",
+    )
+    group.addoption(
+        "--collection-telemetry",
+        action="store_true",
+        help="Send a record with the collection duration and the collection "
+        "time, items and errors of each test module after the collection.",
+    )
     group.addoption(
         "--stage-settings",
         type=str,
-        default=load_and_check_settings_file(
-            os.path.join(os.path.dirname(__file__), "data", "default.stage.json")
-        ),
+        default=None,
         action=SettingFileLoaderAction,
         help="Stage setting description JSON or YAML file path or string object.",
     )
+    parser.addini(
+        "fluentd_enabled",
+        type="bool",
+        default=True,
+        help="Enable the Fluentd logging (default: True)",
+    )
 
 
 def pytest_configure(config):
     """Extend pytest configuration."""
     global FLUENT_RUNTIME
+    if not is_enabled(config):
+        return
     config.fluent = FluentLoggerRuntime(config)
     config.pluginmanager.register(config.fluent, "fluent-reporter-runtime")
+    for name, plugin in config.fluent.feature_plugins.items():
+        config.pluginmanager.register(plugin, name)
     FLUENT_RUNTIME = config.fluent
+    update_context()
 
 
 def pytest_unconfigure(config):
@@ -356,8 +1284,56 @@ def pytest_unconfigure(config):
     fluent = getattr(config, "fluent", None)
     if fluent:
         del config.fluent
+        fluent.close()
         config.pluginmanager.unregister(fluent)
+        for plugin in fluent.feature_plugins.values():
+            config.pluginmanager.unregister(plugin)
         FLUENT_RUNTIME = None
+        FLUENT_CONTEXT.set(None)
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    """Collect the telemetry of a finished pytest-xdist worker."""
+    fluent = getattr(node.config, "fluent", None)
+    telemetry = getattr(node, "workeroutput", {}).get(WORKER_TELEMETRY_WORKEROUTPUT)
+    if fluent is not None and telemetry is not None:
+        fluent.add_worker_telemetry(node.workerinput["workerid"], telemetry)
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    """Pass the session ID to the pytest-xdist workers."""
+    fluent = getattr(node.config, "fluent", None)
+    if fluent is not None:
+        node.workerinput[SESSION_UUID_WORKERINPUT] = fluent.session_uid
+
+
+def is_enabled(config) -> bool:
+    """Check if the Fluentd logging is enabled.
+
+    The command line option takes precedence over the environment variable,
+    which takes precedence over the ini option.
+    """
+    enabled = config.getoption("fluentd_enabled")
+    if enabled is not None:
+        return enabled
+    env_value = os.environ.get(ENABLED_ENV)
+    if env_value:
+        return env_value.strip().lower() not in ["0", "false", "no", "off"]
+    return config.getini("fluentd_enabled")
+
+
+def get_stage_settings(config) -> typing.Dict[str, typing.Any]:
+    """Get the stage settings given by --stage-settings or the default ones.
+
+    The default settings are only loaded if no settings are given, so that
+    sessions with own settings or a disabled plugin do not load them.
+    """
+    stage_settings = config.getoption("--stage-settings")
+    if stage_settings is None:
+        stage_settings = load_default_settings()
+    return stage_settings
 
 
 #####################################################
@@ -372,12 +1348,13 @@ def get_logger(request):
     host = config.getoption("--fluentd-host")
     port = config.getoption("--fluentd-port")
     tag = config.getoption("--fluentd-tag")
+    transport = config.getoption("--fluentd-transport")
 
     def get_logger_wrapper(name=None):
         logger = logging.getLogger(name)
-        if name is None:
+        if name is None or not is_enabled(config):
             return logger
-        add_handler(host, port, tag, logger)
+        add_handler(host, port, tag, logger, transport=transport)
         return logger
 
     return get_logger_wrapper
@@ -401,36 +1378,19 @@ def test_uid() -> typing.Optional[str]:
 
 
 # Logging extensions
-class RecordFormatter(FluentRecordFormatter):
-    """Extension of FluentRecordFormatter in order to add unique ID's."""
-
-    def __init__(self, patcher: typing.Optional[ContentPatcher], *args, **kwargs):
-        """Specific initilization."""
-        super(RecordFormatter, self).__init__(*args, **kwargs)
-        self.content_patcher = patcher
-
-    def format(self, record):
-        """Extend formatting for Fluentd handler."""
-        data = super(RecordFormatter, self).format(record)
-
-        # Extend record by unique ids.
-        data["sessionId"] = get_session_uid()
-        data["testId"] = get_test_uid()
-        data["stage"] = get_stage()
-        if self.content_patcher:
-            data = self.content_patcher.patch(data, "logging", ["tag", "label"])
-        return data
-
-
 def extend_loggers(
     host,
     port,
     tag,
     patcher: ContentPatcher,
-) -> None:
+    buffer_size: typing.Optional[int] = None,
+    transport: str = "blocking",
+) -> typing.List[logging.Handler]:
     """Extend Python logging with a Fluentd handler."""
-    modify_logger(host, port, tag, None, patcher)
-    modify_logger(host, port, tag, "fluent", patcher)
+    return [
+        modify_logger(host, port, tag, None, patcher, buffer_size, transport),
+        modify_logger(host, port, tag, "fluent", patcher, buffer_size, transport),
+    ]
 
 
 def modify_logger(
@@ -439,10 +1399,12 @@ def modify_logger(
     tag,
     name=None,
     patcher: typing.Optional[ContentPatcher] = None,
-) -> None:
+    buffer_size: typing.Optional[int] = None,
+    transport: str = "blocking",
+) -> logging.Handler:
     """Extend Python logging with a Fluentd handler."""
     logger = logging.getLogger(name)
-    add_handler(host, port, tag, logger, patcher)
+    return add_handler(host, port, tag, logger, patcher, buffer_size, transport)
 
 
 def add_handler(
@@ -451,14 +1413,46 @@ def add_handler(
     tag,
     logger,
     patcher: typing.Optional[ContentPatcher] = None,
-):
-    """Add handler to a specific logger."""
-    handler = FluentHandler(
-        tag, host=host, port=port, buffer_overflow_handler=overflow_handler
-    )
+    buffer_size: typing.Optional[int] = None,
+    transport: str = "blocking",
+) -> logging.Handler:
+    """Add handler to a specific logger.
+
+    If a buffer size is given, testcase records are only sent for failed tests.
+    The transport selects whether records are sent directly, from a background
+    thread or from a background thread only within an event loop.
+    """
+    handler: logging.Handler
+    reset_after_fork = get_lazy_attribute("reset_handler_sender")
+    if buffer_size is not None:
+        buffered_handler_class = get_lazy_attribute("BufferedFluentHandler")
+        reset_after_fork = buffered_handler_class.reset_after_fork
+        handler = buffered_handler_class(
+            tag,
+            buffer_size,
+            patcher,
+            transport=transport,
+            host=host,
+            port=port,
+            buffer_overflow_handler=overflow_handler,
+        )
+    elif transport == "background":
+        handler = get_lazy_attribute("AsyncFluentHandler")(
+            tag, host=host, port=port, buffer_overflow_handler=overflow_handler
+        )
+    elif transport == "auto":
+        handler = get_lazy_attribute("LoopAwareFluentHandler")(
+            tag, host=host, port=port, buffer_overflow_handler=overflow_handler
+        )
+    else:
+        handler = get_lazy_attribute("FluentHandler")(
+            tag, host=host, port=port, buffer_overflow_handler=overflow_handler
+        )
     formatter = get_formatter(patcher)
     handler.setFormatter(formatter)
+    get_lazy_attribute("register_after_fork_reset")(handler, reset_after_fork)
     logger.addHandler(handler)
+    return handler
 
 
 def get_formatter(patcher: typing.Optional[ContentPatcher] = None) -> logging.Formatter:
@@ -480,7 +1474,7 @@ def get_formatter(patcher: typing.Optional[ContentPatcher] = None) -> logging.Fo
     if record_formatter:
         formatter = load_record_formatter_class(record_formatter)
     else:
-        formatter = RecordFormatter(
+        formatter = get_lazy_attribute("RecordFormatter")(
             patcher,
             {
                 "type": "logging",
@@ -495,7 +1489,7 @@ def get_formatter(patcher: typing.Optional[ContentPatcher] = None) -> logging.Fo
 
 
 def load_record_formatter_class(
-    record_formatter_settings: typing.Dict[str, str]
+    record_formatter_settings: typing.Dict[str, str],
 ) -> logging.Formatter:
     """Load a custom record formatter.
 
@@ -516,6 +1510,8 @@ def load_record_formatter_class(
 
 def overflow_handler(pendings):
     """Customize overflow handler."""
+    import msgpack
+
     unpacker = msgpack.Unpacker(BytesIO(pendings))
     for unpacked in unpacker:
         print(unpacked)
@@ -525,11 +1521,66 @@ def set_stage(val: str) -> None:
     """Set the current execution stage."""
     global STAGE
     STAGE = val
+    update_context()
 
 
 def get_stage() -> str:
     """Get the current execution stage."""
-    return STAGE
+    return get_context().stage
+
+
+# Context
+
+
+def update_context() -> None:
+    """Store the current session, test and stage information in the context."""
+    if FLUENT_RUNTIME is None:
+        context = FluentContext(None, None, STAGE)
+    else:
+        runtime = typing.cast(FluentLoggerRuntime, FLUENT_RUNTIME)
+        context = FluentContext(runtime.session_uid, runtime.test_uid, STAGE)
+    if FLUENT_CONTEXT.get() != context:
+        FLUENT_CONTEXT.set(context)
+
+
+def get_context() -> FluentContext:
+    """Get the session, test and stage information of the current context.
+
+    Threads which were not started with a bound context fall back to the
+    information of the currently running test.
+    """
+    context = FLUENT_CONTEXT.get()
+    if context is not None:
+        return context
+    if FLUENT_RUNTIME is None:
+        return FluentContext(None, None, STAGE)
+    runtime = typing.cast(FluentLoggerRuntime, FLUENT_RUNTIME)
+    return FluentContext(runtime.session_uid, runtime.test_uid, STAGE)
+
+
+def bind_context(function: typing.Callable) -> typing.Callable:
+    """Bind a callable to the current context, e.g. before passing it to a thread.
+
+    Records logged by the callable are attributed to the session and test
+    which were active when binding, even if they are emitted later.
+
+    Args:
+        function (typing.Callable): Callable to bind.
+
+    Returns:
+        typing.Callable: Callable running with the bound context.
+    """
+    context = get_context()
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        token = FLUENT_CONTEXT.set(context)
+        try:
+            return function(*args, **kwargs)
+        finally:
+            FLUENT_CONTEXT.reset(token)
+
+    return wrapper
 
 
 # Unique identifiers
@@ -542,21 +1593,51 @@ def create_unique_identifier():
 
 def get_session_uid() -> typing.Optional[str]:
     """Get current session UID."""
-    if FLUENT_RUNTIME is None:
-        return None
-    return typing.cast(FluentLoggerRuntime, FLUENT_RUNTIME).session_uid
+    return get_context().session_uid
 
 
 def get_test_uid() -> typing.Optional[str]:
     """Get current test UID."""
-    if FLUENT_RUNTIME is None:
-        return None
-    return typing.cast(FluentLoggerRuntime, FLUENT_RUNTIME).test_uid
+    return get_context().test_uid
 
 
 # Docstrings
 
 
+def get_markers(item: pytest.Item, with_args: bool = False) -> list:
+    """Extract the markers applied to a pytest test item.
+
+    Args:
+        item (pytest.Item): Test item.
+        with_args (bool, optional): Add the marker arguments. Defaults to False.
+
+    Returns:
+        list: Unique marker names or marker dictionaries with name, args and
+            kwargs. Arguments, which are not JSON types, are converted to strings.
+    """
+    if not with_args:
+        return list(dict.fromkeys(marker.name for marker in item.iter_markers()))
+    return [
+        {
+            "name": marker.name,
+            "args": [to_json_type(arg) for arg in marker.args],
+            "kwargs": {key: to_json_type(arg) for key, arg in marker.kwargs.items()},
+        }
+        for marker in item.iter_markers()
+    ]
+
+
+def to_json_type(value: typing.Any) -> typing.Any:
+    """Convert a value into a JSON type, unknown types are represented as string."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return [to_json_type(element) for element in value]
+    if isinstance(value, dict):
+        return {str(key): to_json_type(element) for key, element in value.items()}
+    return repr(value)
+
+
 def get_test_docstring(item: pytest.Item) -> typing.Optional[str]:
     """Extract the docstring from a pytest test item."""
     if hasattr(item, "obj") and item.obj.__doc__ is not None:
@@ -0,0 +1,84 @@
+"""Detect test duration regressions against stored baselines."""
+
+import typing
+
+
+class Regression(typing.NamedTuple):
+    """Call duration of a test exceeding its baseline."""
+
+    nodeid: str
+    duration: float
+    baseline: float
+
+    @property
+    def ratio(self) -> float:
+        """Return the duration relative to the baseline."""
+        return self.duration / self.baseline if self.baseline else float("inf")
+
+
+class RegressionDetector:
+    """Compare call durations against their baselines.
+
+    A duration is a regression if it exceeds the baseline by the threshold
+    ratio and by the minimum delta, so that the jitter of very short tests is
+    not reported.
+
+    Args:
+        baselines (typing.Dict[str, float]): Baseline duration per node ID.
+        threshold (float): Minimum ratio of duration and baseline.
+        min_delta (float): Minimum difference of duration and baseline in seconds.
+    """
+
+    def __init__(
+        self, baselines: typing.Dict[str, float], threshold: float, min_delta: float
+    ) -> None:
+        """Initialize regression detector."""
+        self.baselines = baselines
+        self.threshold = threshold
+        self.min_delta = min_delta
+        self.regressions: typing.List[Regression] = []
+
+    def _is_regression(self, duration: float, baseline: float) -> bool:
+        return (
+            duration >= baseline * self.threshold
+            and duration - baseline >= self.min_delta
+        )
+
+    def check(self, nodeid: str, duration: float) -> typing.Optional[Regression]:
+        """Check a call duration and record it if it is a regression.
+
+        Returns:
+            typing.Optional[Regression]: The regression or None if the duration
+                is not a regression or the test has no baseline.
+        """
+        baseline = self.baselines.get(nodeid)
+        if baseline is None:
+            return None
+        if not self._is_regression(duration, baseline):
+            return None
+        regression = Regression(nodeid, duration, baseline)
+        self.regressions.append(regression)
+        return regression
+
+    def get_fields(self, nodeid: str, duration: float) -> dict:
+        """Create the regression fields of a call report.
+
+        Unlike check, the regression is not recorded.
+
+        Returns:
+            dict: Baseline duration and regression flag, empty if the test has
+                no baseline.
+        """
+        baseline = self.baselines.get(nodeid)
+        if baseline is None:
+            return {}
+        return {
+            "durationBaseline": baseline,
+            "regression": self._is_regression(duration, baseline),
+        }
+
+    def get_top(self, count: int) -> typing.List[Regression]:
+        """Return the regressions with the largest ratios first."""
+        return sorted(self.regressions, key=lambda regression: -regression.ratio)[
+            :count
+        ]
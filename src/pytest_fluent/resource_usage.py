@@ -0,0 +1,82 @@
+"""Resource usage of the test calls."""
+
+import gc
+import sys
+import time
+import typing
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore
+
+# ru_maxrss is given in bytes on macOS and in kilobytes elsewhere
+MAX_RSS_UNIT = 1 if sys.platform == "darwin" else 1024
+
+
+class ResourceMonitor:
+    """Measure the resource usage of the process between start and stop.
+
+    The CPU times, the growth of the peak resident set size and the context
+    switches are taken from getrusage, which is not available on Windows.
+    Garbage collections and their duration are counted with a gc callback,
+    which is only registered while measuring.
+    """
+
+    def __init__(self) -> None:
+        """Initialize resource monitor."""
+        self._start_usage: typing.Optional[typing.Any] = None
+        self._gc_collections = [0] * len(gc.get_count())
+        self._gc_time = 0.0
+        self._gc_start_time: typing.Optional[float] = None
+
+    def _gc_callback(self, phase: str, info: typing.Dict[str, int]) -> None:
+        if phase == "start":
+            self._gc_start_time = time.perf_counter()
+        elif self._gc_start_time is not None:
+            self._gc_time += time.perf_counter() - self._gc_start_time
+            self._gc_collections[info["generation"]] += 1
+            self._gc_start_time = None
+
+    def start(self) -> None:
+        """Start measuring."""
+        self._gc_collections = [0] * len(self._gc_collections)
+        self._gc_time = 0.0
+        self._gc_start_time = None
+        if self._gc_callback not in gc.callbacks:
+            gc.callbacks.append(self._gc_callback)
+        if resource is not None:
+            self._start_usage = resource.getrusage(resource.RUSAGE_SELF)
+
+    def stop(self) -> dict:
+        """Stop measuring.
+
+        Returns:
+            dict: CPU user and system time in seconds, growth of the peak
+                resident set size in bytes, voluntary and involuntary context
+                switches, garbage collections per generation and their time
+                in seconds.
+        """
+        if self._gc_callback in gc.callbacks:
+            gc.callbacks.remove(self._gc_callback)
+        usage: typing.Dict[str, typing.Any] = {}
+        if resource is not None and self._start_usage is not None:
+            start = self._start_usage
+            stop = resource.getrusage(resource.RUSAGE_SELF)
+            usage.update(
+                {
+                    "cpu_user": stop.ru_utime - start.ru_utime,
+                    "cpu_system": stop.ru_stime - start.ru_stime,
+                    "max_rss_delta": (stop.ru_maxrss - start.ru_maxrss) * MAX_RSS_UNIT,
+                    "voluntary_context_switches": stop.ru_nvcsw - start.ru_nvcsw,
+                    "involuntary_context_switches": stop.ru_nivcsw - start.ru_nivcsw,
+                }
+            )
+            self._start_usage = None
+        usage.update(
+            {
+                "gc_collections": list(self._gc_collections),
+                "gc_time": self._gc_time,
+            }
+        )
+        return usage
@@ -0,0 +1,203 @@
+"""Aggregate test outcomes and durations for session rollup records."""
+
+import collections
+import math
+import typing
+
+# Resolution of the smallest duration bucket in seconds
+MIN_DURATION = 1e-6
+# Number of logarithmic buckets per doubling of the duration
+BUCKETS_PER_OCTAVE = 4
+PERCENTILES = [50, 90, 99]
+
+
+class DurationHistogram:
+    """Histogram of durations with logarithmic buckets.
+
+    Similar to HDR histograms, the bucket width grows with the duration, so
+    the relative error of each bucket is bounded (about 19% with 4 buckets per
+    octave) while the memory usage only depends on the range of durations.
+    """
+
+    def __init__(self) -> None:
+        """Initialize duration histogram."""
+        self.buckets: typing.Dict[int, int] = {}
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    @staticmethod
+    def get_bucket(duration: float) -> int:
+        """Return the index of the bucket containing the duration."""
+        if duration <= MIN_DURATION:
+            return 0
+        return math.ceil(math.log2(duration / MIN_DURATION) * BUCKETS_PER_OCTAVE)
+
+    @staticmethod
+    def get_upper_bound(bucket: int) -> float:
+        """Return the upper duration bound of a bucket in seconds."""
+        return MIN_DURATION * 2 ** (bucket / BUCKETS_PER_OCTAVE)
+
+    def add(self, duration: float) -> None:
+        """Add a duration in seconds."""
+        bucket = self.get_bucket(duration)
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.sum += duration
+        self.min = min(self.min, duration)
+        self.max = max(self.max, duration)
+
+    def get_percentile(self, percentile: float) -> float:
+        """Return the upper bound of the bucket containing the percentile."""
+        rank = math.ceil(self.count * percentile / 100)
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                return min(self.get_upper_bound(bucket), self.max)
+        return self.max
+
+    def merge(self, other: "DurationHistogram") -> None:
+        """Add the durations of another histogram."""
+        for bucket, count in other.buckets.items():
+            self.buckets[bucket] = self.buckets.get(bucket, 0) + count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def to_state(self) -> dict:
+        """Convert the histogram into a JSON serializable state."""
+        return {
+            "buckets": {str(bucket): count for bucket, count in self.buckets.items()},
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min if self.count else None,
+            "max": self.max,
+        }
+
+    @classmethod
+    def from_state(cls, state: dict) -> "DurationHistogram":
+        """Restore a histogram from its state."""
+        histogram = cls()
+        histogram.buckets = {
+            int(bucket): count for bucket, count in state["buckets"].items()
+        }
+        histogram.count = state["count"]
+        histogram.sum = state["sum"]
+        histogram.min = math.inf if state["min"] is None else state["min"]
+        histogram.max = state["max"]
+        return histogram
+
+    def to_dict(self) -> dict:
+        """Convert the histogram into a serializable dictionary.
+
+        The buckets are given as a list of upper bounds in seconds and counts.
+        """
+        if not self.count:
+            return {"count": 0}
+        data: typing.Dict[str, typing.Any] = {
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min,
+            "max": self.max,
+        }
+        for percentile in PERCENTILES:
+            data[f"p{percentile}"] = self.get_percentile(percentile)
+        data["buckets"] = [
+            [self.get_upper_bound(bucket), self.buckets[bucket]]
+            for bucket in sorted(self.buckets)
+        ]
+        return data
+
+
+class RollupGroup:
+    """Outcome counts and duration histogram of a group of tests."""
+
+    def __init__(self) -> None:
+        """Initialize rollup group."""
+        self.outcomes: typing.Counter[str] = collections.Counter()
+        self.durations = DurationHistogram()
+
+    def add(self, outcome: str, duration: float) -> None:
+        """Add the outcome and duration of a test."""
+        self.outcomes[outcome] += 1
+        self.durations.add(duration)
+
+
+class Rollup:
+    """Aggregate test results per module and per marker."""
+
+    def __init__(self) -> None:
+        """Initialize rollup."""
+        self.groups: typing.Dict[typing.Tuple[str, str], RollupGroup] = {}
+
+    def add(
+        self,
+        nodeid: str,
+        markers: typing.Iterable[str],
+        outcome: str,
+        duration: float,
+    ) -> None:
+        """Add a test result to its module and marker groups.
+
+        Args:
+            nodeid (str): Test node ID.
+            markers (typing.Iterable[str]): Marker names of the test.
+            outcome (str): Test outcome.
+            duration (float): Test duration in seconds.
+        """
+        keys = [("module", nodeid.split("::")[0])]
+        keys.extend(("marker", marker) for marker in markers)
+        for key in keys:
+            group = self.groups.get(key)
+            if group is None:
+                group = RollupGroup()
+                self.groups[key] = group
+            group.add(outcome, duration)
+
+    def merge(self, other: "Rollup") -> None:
+        """Add the test results of another rollup, e.g. of another shard."""
+        for key, other_group in other.groups.items():
+            group = self.groups.get(key)
+            if group is None:
+                group = RollupGroup()
+                self.groups[key] = group
+            group.outcomes.update(other_group.outcomes)
+            group.durations.merge(other_group.durations)
+
+    def to_state(self) -> typing.List[list]:
+        """Convert the rollup into a JSON serializable state."""
+        return [
+            [group_type, name, dict(group.outcomes), group.durations.to_state()]
+            for (group_type, name), group in self.groups.items()
+        ]
+
+    @classmethod
+    def from_state(cls, state: typing.List[list]) -> "Rollup":
+        """Restore a rollup from its state."""
+        rollup = cls()
+        for group_type, name, outcomes, durations in state:
+            group = RollupGroup()
+            group.outcomes.update(outcomes)
+            group.durations = DurationHistogram.from_state(durations)
+            rollup.groups[(group_type, name)] = group
+        return rollup
+
+    def to_records(self) -> typing.List[dict]:
+        """Create one record per group.
+
+        Returns:
+            typing.List[dict]: Rollup records with group type, name, outcome
+                counts and duration histogram.
+        """
+        return [
+            {
+                "group": group_type,
+                "name": name,
+                "outcomes": dict(group.outcomes),
+                "durations": group.durations.to_dict(),
+            }
+            for (group_type, name), group in sorted(self.groups.items())
+        ]
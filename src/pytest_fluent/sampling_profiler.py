@@ -0,0 +1,116 @@
+"""Sampling profiler for the test calls."""
+
+import collections
+import os
+import sys
+import threading
+import time
+import typing
+
+# Number of the most frequent stacks added to a profile
+MAX_STACKS = 20
+# Modules of the test runner, whose frames are left out of the stacks
+RUNNER_MODULES = ("_pytest.", "pluggy.", "pytest_fluent.")
+
+
+def collapse_stack(frame: typing.Any) -> str:
+    """Collapse the stack of a frame into a single line, the root frame first.
+
+    The frames are given as file name and function name separated by
+    semicolons, like the collapsed stacks used for flame graphs.
+    """
+    frames = []
+    while frame is not None:
+        module_name = frame.f_globals.get("__name__", "")
+        if not module_name.startswith(RUNNER_MODULES):
+            code = frame.f_code
+            frames.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+        frame = frame.f_back
+    return ";".join(reversed(frames))
+
+
+class SamplingProfiler:
+    """Sample the stack of a thread in a background thread.
+
+    The background thread is started on the first use and only samples while
+    a profile is being taken, otherwise it waits.
+
+    Args:
+        interval (float): Sampling interval in seconds.
+    """
+
+    def __init__(self, interval: float) -> None:
+        """Initialize sampling profiler."""
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._active = threading.Event()
+        self._closed = False
+        self._thread: typing.Optional[threading.Thread] = None
+        self._thread_id: typing.Optional[int] = None
+        self._samples: typing.Counter[str] = collections.Counter()
+
+    def _run(self) -> None:
+        while True:
+            self._active.wait()
+            if self._closed:
+                return
+            time.sleep(self.interval)
+            self._sample()
+
+    def _sample(self) -> None:
+        with self._lock:
+            if self._thread_id is None:
+                return
+            frame = sys._current_frames().get(self._thread_id)
+            if frame is not None:
+                self._samples[collapse_stack(frame)] += 1
+
+    def start(self) -> None:
+        """Start sampling the calling thread."""
+        with self._lock:
+            self._samples = collections.Counter()
+            self._thread_id = threading.get_ident()
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="pytest-fluent-profiler", daemon=True
+            )
+            self._thread.start()
+        self._active.set()
+
+    def stop(self) -> typing.Counter[str]:
+        """Stop sampling.
+
+        Returns:
+            typing.Counter[str]: Number of samples per collapsed stack.
+        """
+        self._active.clear()
+        with self._lock:
+            self._thread_id = None
+            samples = self._samples
+            self._samples = collections.Counter()
+        return samples
+
+    def close(self) -> None:
+        """Stop the background thread."""
+        self.stop()
+        self._closed = True
+        self._active.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def to_profile(self, samples: typing.Counter[str]) -> dict:
+        """Create the profile of the samples.
+
+        Returns:
+            dict: Sampling interval in seconds, number of samples and the most
+                frequent collapsed stacks with their number of samples.
+        """
+        return {
+            "interval": self.interval,
+            "samples": sum(samples.values()),
+            "stacks": [
+                {"stack": stack, "count": count}
+                for stack, count in samples.most_common(MAX_STACKS)
+            ],
+        }
@@ -1,14 +1,22 @@
 """Load and schema check settings file."""
 
 import argparse
+import functools
+import hashlib
 import json
 import os
 import re
+import tempfile
 import typing
 from io import StringIO
 
-import jsonschema
-from ruamel.yaml import YAML
+DATA_PATH = os.path.join(os.path.dirname(__file__), "data")
+SCHEMA_FILE = os.path.join(DATA_PATH, "schema.stage.json")
+DEFAULT_SETTINGS_FILE = os.path.join(DATA_PATH, "default.stage.json")
+# Directory for validated settings, an empty value disables the cache.
+CACHE_DIR_ENV = "PYTEST_FLUENT_CACHE_DIR"
+# Maximum number of cached settings, the least recently used are evicted.
+MAX_CACHE_ENTRIES = 32
 
 
 class SettingFileLoaderAction(argparse.Action):
@@ -20,9 +28,22 @@ class SettingFileLoaderAction(argparse.Action):
         setattr(args, self.dest, parameter)
 
 
+def load_default_settings() -> typing.Dict[str, typing.Any]:
+    """Load the default stage settings.
+
+    Returns:
+        typing.Dict[str, typing.Any]: Default settings dictionary.
+    """
+    return load_and_check_settings_file(DEFAULT_SETTINGS_FILE)
+
+
 def load_and_check_settings_file(file_name: str) -> typing.Dict[str, typing.Any]:
     """Load settings file and check content against schema.
 
+    Validated settings are cached on disk, keyed by the hash of the schema and
+    the settings content, so that unchanged settings are neither parsed nor
+    validated again.
+
     Args:
         file_name (str): Path to settings file.
 
@@ -46,26 +67,166 @@ def load_and_check_settings_file(file_name: str) -> typing.Dict[str, typing.Any]
     if len(splitted) == 2:
         data_format, file_data = splitted
     if data_format == "json" or file_data.endswith(".json"):
-        pickle = json
+        data_format = "json"
     elif data_format == "yaml" or file_data.endswith(".yaml"):
-        pickle = YAML()
-
-        def loads(file_pointer):
-            stream = StringIO(file_pointer)
-            return pickle.load(stream)
-
-        setattr(pickle, "loads", loads)
+        data_format = "yaml"
     else:
         raise ValueError("Wrong input format or file type not supported.")
     if os.path.exists(file_data):
         with open(file_data, encoding="utf-8") as fid:
-            content = pickle.load(fid)
+            raw_content = fid.read()
+    else:
+        raw_content = file_data
+    cache_key = get_cache_key(data_format, raw_content)
+    content = read_cached_settings(cache_key)
+    if content is not None:
+        return content
+    # Parsing and validation dependencies are only imported on a cache miss
+    import jsonschema
+
+    if data_format == "json":
+        content = json.loads(raw_content)
     else:
-        content = pickle.loads(file_data)
-    with open(
-        os.path.join(os.path.dirname(__file__), "data", "schema.stage.json"),
-        encoding="utf-8",
-    ) as fid:
-        schema = json.load(fid)
-    jsonschema.validate(instance=content, schema=schema)
+        from ruamel.yaml import YAML
+
+        content = YAML().load(StringIO(raw_content))
+    error = jsonschema.exceptions.best_match(
+        get_schema_validator().iter_errors(content)
+    )
+    if error is not None:
+        raise error
+    write_cached_settings(cache_key, content)
+    return content
+
+
+@functools.lru_cache(maxsize=None)
+def get_schema() -> str:
+    """Read the stage settings schema.
+
+    Returns:
+        str: Schema file content.
+    """
+    with open(SCHEMA_FILE, encoding="utf-8") as fid:
+        return fid.read()
+
+
+@functools.lru_cache(maxsize=None)
+def get_schema_validator() -> typing.Any:
+    """Create a checked validator for the stage settings schema once.
+
+    Returns:
+        typing.Any: JSON schema validator instance.
+    """
+    import jsonschema
+
+    schema = json.loads(get_schema())
+    validator_class = jsonschema.validators.validator_for(schema)
+    validator_class.check_schema(schema)
+    return validator_class(schema)
+
+
+def get_cache_key(data_format: str, raw_content: str) -> str:
+    """Create the cache key of settings content.
+
+    Args:
+        data_format (str): Settings format.
+        raw_content (str): Unparsed settings content.
+
+    Returns:
+        str: Cache key.
+    """
+    digest = hashlib.sha256()
+    for part in [get_schema(), data_format, raw_content]:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def get_cache_dir() -> typing.Optional[str]:
+    """Get the directory of the settings cache.
+
+    Returns:
+        typing.Optional[str]: Cache directory or None if caching is disabled.
+    """
+    cache_dir = os.environ.get(CACHE_DIR_ENV)
+    if cache_dir is None:
+        base_dir = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+            os.path.expanduser("~"), ".cache"
+        )
+        cache_dir = os.path.join(base_dir, "pytest-fluent")
+    return cache_dir or None
+
+
+def read_cached_settings(
+    cache_key: str,
+) -> typing.Optional[typing.Dict[str, typing.Any]]:
+    """Read validated settings from the cache.
+
+    Args:
+        cache_key (str): Cache key.
+
+    Returns:
+        typing.Optional[typing.Dict[str, typing.Any]]: Settings or None if the
+            settings are not cached.
+    """
+    cache_dir = get_cache_dir()
+    if cache_dir is None:
+        return None
+    path = os.path.join(cache_dir, f"{cache_key}.json")
+    try:
+        with open(path, encoding="utf-8") as fid:
+            content = json.load(fid)
+        # Mark the entry as recently used for the eviction
+        os.utime(path)
+    except (OSError, ValueError):
+        return None
     return content
+
+
+def write_cached_settings(
+    cache_key: str, content: typing.Dict[str, typing.Any]
+) -> None:
+    """Write validated settings to the cache.
+
+    Failures are ignored, since the cache is only an optimization.
+
+    Args:
+        cache_key (str): Cache key.
+        content (typing.Dict[str, typing.Any]): Validated settings.
+    """
+    cache_dir = get_cache_dir()
+    if cache_dir is None:
+        return
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        file_descriptor, temp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(file_descriptor, "w", encoding="utf-8") as fid:
+                json.dump(content, fid)
+            os.replace(temp_path, os.path.join(cache_dir, f"{cache_key}.json"))
+        except BaseException:
+            os.remove(temp_path)
+            raise
+        evict_cached_settings(cache_dir)
+    except (OSError, TypeError, ValueError):
+        pass
+
+
+def evict_cached_settings(cache_dir: str) -> None:
+    """Remove the least recently used settings exceeding the cache size.
+
+    Args:
+        cache_dir (str): Cache directory.
+    """
+    entries = []
+    for entry in os.scandir(cache_dir):
+        if entry.name.endswith(".json"):
+            try:
+                entries.append((entry.stat().st_mtime, entry.path))
+            except OSError:
+                continue
+    for _, path in sorted(entries, reverse=True)[MAX_CACHE_ENTRIES:]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,103 @@
+"""Merge the summaries of sessions split into shards via a shared directory."""
+
+import collections
+import json
+import os
+import tempfile
+import typing
+
+from .rollup import Rollup
+
+MERGED_FILE = "merged"
+
+
+def get_session_dir(shard_dir: str, session_uid: str) -> str:
+    """Return the directory holding the shard summaries of a session."""
+    return os.path.join(shard_dir, session_uid)
+
+
+def write_shard_summary(
+    shard_dir: str, session_uid: str, shard_index: int, summary: dict
+) -> None:
+    """Write the summary of a shard atomically into the shared directory.
+
+    Args:
+        shard_dir (str): Directory shared by all shards.
+        session_uid (str): Session ID shared by all shards.
+        shard_index (int): Index of the shard.
+        summary (dict): JSON serializable summary of the shard.
+    """
+    session_dir = get_session_dir(shard_dir, session_uid)
+    os.makedirs(session_dir, exist_ok=True)
+    file_descriptor, temp_path = tempfile.mkstemp(dir=session_dir, suffix=".tmp")
+    try:
+        with os.fdopen(file_descriptor, "w", encoding="utf-8") as fid:
+            json.dump(summary, fid)
+        os.replace(temp_path, os.path.join(session_dir, f"shard-{shard_index}.json"))
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+
+def read_shard_summaries(
+    shard_dir: str, session_uid: str, shard_count: int
+) -> typing.Optional[typing.List[dict]]:
+    """Read the summaries of all shards.
+
+    Returns:
+        typing.Optional[typing.List[dict]]: Summaries ordered by the shard index
+            or None if a shard has not finished yet.
+    """
+    session_dir = get_session_dir(shard_dir, session_uid)
+    summaries = []
+    for shard_index in range(shard_count):
+        path = os.path.join(session_dir, f"shard-{shard_index}.json")
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding="utf-8") as fid:
+            summaries.append(json.load(fid))
+    return summaries
+
+
+def claim_merge(shard_dir: str, session_uid: str) -> bool:
+    """Claim the merge of the shard summaries.
+
+    The claim is an exclusively created file, so only a single shard sends
+    the merged summary, even if several shards finish at the same time.
+    """
+    path = os.path.join(get_session_dir(shard_dir, session_uid), MERGED_FILE)
+    try:
+        os.close(os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+    except FileExistsError:
+        return False
+    return True
+
+
+def merge_shard_summaries(summaries: typing.List[dict]) -> dict:
+    """Merge the summaries of all shards into a session summary.
+
+    Args:
+        summaries (typing.List[dict]): Summaries of all shards.
+
+    Returns:
+        dict: Number of shards and tests, outcome counts, longest shard duration,
+            the summed shard durations and the merged rollup records, if any.
+    """
+    outcomes: typing.Counter[str] = collections.Counter()
+    rollup = None
+    for summary in summaries:
+        outcomes.update(summary["outcomes"])
+        if summary.get("rollup") is not None:
+            if rollup is None:
+                rollup = Rollup()
+            rollup.merge(Rollup.from_state(summary["rollup"]))
+    merged: typing.Dict[str, typing.Any] = {
+        "shards": len(summaries),
+        "tests": sum(summary["tests"] for summary in summaries),
+        "outcomes": dict(outcomes),
+        "duration": max(summary["duration"] for summary in summaries),
+        "shard_duration": sum(summary["duration"] for summary in summaries),
+    }
+    if rollup is not None:
+        merged["rollup"] = rollup.to_records()
+    return merged
@@ -24,15 +24,35 @@
 #
 # Adopted from https://github.com/fruch/pytest-elk-reporter
 
+import os
 import typing
 
 import pytest
 import six
 
+# Report stash key of the structured frames of the raw traceback
+TRACEBACK_FRAMES_KEY = "traceback_frames"
+# Modules of the test runner, whose frames are left out of the traceback
+RUNNER_MODULES = ("_pytest.", "pluggy.")
+# Report stash key of the compact markers of the test item
+MARKERS_KEY = "markers"
+# Report stash key of the report data precomputed by a pytest-xdist worker
+PRECOMPUTED_KEY = "fluent_report"
+
 
 class LogReport(object):
-    def __init__(self, config):
+    def __init__(self, config, dropped_keys: typing.AbstractSet[str] = frozenset()):
         self.config = config
+        self.dropped_keys = dropped_keys
+        self.add_captured_output = config.getoption("--add-captured-output")
+        self.captured_output_max_size = config.getoption("--captured-output-max-size")
+        self.captured_output_chunk_size = config.getoption(
+            "--captured-output-chunk-size"
+        )
+        self.failure_detail = config.getoption("--failure-detail")
+        self.failure_message_max_size = config.getoption("--failure-message-max-size")
+        self.structured_traceback = config.getoption("--structured-traceback")
+        self.emit_from_workers = config.getoption("--emit-from-workers")
         super(LogReport, self).__init__()
 
     def __call__(self, report: pytest.TestReport):
@@ -41,10 +61,23 @@ class LogReport(object):
         results: typing.Dict[typing.Any, typing.Any] = {}
 
         worker_id = self.get_worker_id()
+        if self.emit_from_workers:
+            # workers are sending their results directly
+            if worker_id == "master":
+                return results
         # wait until workers are senting back their results.
         # See https://pytest-xdist.readthedocs.io/en/latest/how-it-works.html
-        if worker_id not in ["master", "default"]:
+        elif worker_id not in ["master", "default"]:
             return results
+        stash = getattr(report, "stash", None) or {}
+        if PRECOMPUTED_KEY in stash:
+            results.update(stash[PRECOMPUTED_KEY])
+            return results
+        results.update(self.get_report_data(report))
+        return results
+
+    def get_report_data(self, report: pytest.TestReport) -> dict:
+        """Create the report dataset regardless of the worker."""
         data = None
 
         if report.passed:
@@ -72,10 +105,7 @@ class LogReport(object):
             data = self.create_report_with_verdict(
                 report, lambda x: hasattr(x, "wasxfail"), "xfailed", "skipped"
             )
-
-        if data:
-            results.update(data)
-        return results
+        return data or {}
 
     def create_report_with_verdict(
         self,
@@ -94,19 +124,161 @@ class LogReport(object):
         item_report: pytest.TestReport,
         verdict: str,
     ):
-        """Create test report dataset."""
+        """Create test report dataset.
+
+        Fields dropped by the stage settings are not computed at all.
+        """
         test_data = dict(
             item_report.user_properties,
             name=item_report.nodeid,
             outcome=verdict,
             duration=item_report.duration,
-            markers=item_report.keywords,
         )
-        message = self.get_failure_messge(item_report)
-        if message:
-            test_data.update(failure_message=message)
+        if "markers" not in self.dropped_keys:
+            stash = getattr(item_report, "stash", None) or {}
+            markers = stash.get(MARKERS_KEY)
+            if markers is None:
+                markers = item_report.keywords
+            test_data.update(markers=markers)
+        if "failure_message" not in self.dropped_keys:
+            message = self.get_failure_messge(item_report, self.failure_detail)
+            if message:
+                encoded = message.encode("utf-8")
+                if self.failure_message_max_size and (
+                    len(encoded) > self.failure_message_max_size
+                ):
+                    message = encoded[: self.failure_message_max_size].decode(
+                        "utf-8", errors="ignore"
+                    )
+                    test_data.update(failure_message_truncated=True)
+                test_data.update(failure_message=message)
+        if self.structured_traceback and "traceback" not in self.dropped_keys:
+            frames = self.get_traceback_frames(item_report)
+            if frames:
+                test_data.update(traceback=frames)
+        if self.add_captured_output and "captured" not in self.dropped_keys:
+            captured = self.get_captured_output(item_report)
+            if captured:
+                test_data.update(captured=captured)
         return test_data
 
+    def get_captured_output(self, item_report) -> typing.List[dict]:
+        """Extract captured log, stdout and stderr sections.
+
+        Each section content is capped to the maximum size in bytes and split
+        into chunks in order to stay below record field limits of the log sink.
+        """
+        captured = []
+        for name, content in getattr(item_report, "sections", []):
+            if not content:
+                continue
+            encoded = content.encode("utf-8")
+            section: typing.Dict[str, typing.Any] = {"section": name}
+            if self.captured_output_max_size and (
+                len(encoded) > self.captured_output_max_size
+            ):
+                encoded = encoded[: self.captured_output_max_size]
+                section.update(truncated=True)
+            section.update(
+                content=[
+                    chunk.decode("utf-8", errors="ignore")
+                    for chunk in self.split_chunks(
+                        encoded, self.captured_output_chunk_size
+                    )
+                ]
+            )
+            captured.append(section)
+        return captured
+
+    @staticmethod
+    def get_traceback_frames(item_report) -> typing.List[dict]:
+        """Get the structured traceback frames stored at report creation.
+
+        The frames are extracted from the raw exception, see
+        extract_traceback_frames, so they do not depend on the traceback style
+        of the rendered report.
+        """
+        if item_report.passed:
+            return []
+        stash = getattr(item_report, "stash", None) or {}
+        return [dict(frame) for frame in stash.get(TRACEBACK_FRAMES_KEY, [])]
+
+    @staticmethod
+    def extract_traceback_frames(
+        excinfo: pytest.ExceptionInfo, root_dir: str
+    ) -> typing.List[dict]:
+        """Extract the traceback frames of an exception as structured data.
+
+        Each frame provides the file, line and function. The frame where the
+        exception was raised additionally provides the exception type. Frames
+        of pytest and pluggy and frames hidden with __tracebackhide__ are left
+        out. Like in the pytest reports, file paths are relative to the root
+        directory if that is shorter.
+
+        Args:
+            excinfo (pytest.ExceptionInfo): Raw exception of the test phase.
+            root_dir (str): Directory the file paths are relative to.
+        """
+        frames = []
+        for entry in excinfo.traceback:
+            frame = entry.frame
+            if frame.f_globals.get("__name__", "").startswith(RUNNER_MODULES):
+                continue
+            if frame.f_locals.get("__tracebackhide__") or frame.f_globals.get(
+                "__tracebackhide__"
+            ):
+                continue
+            path = str(entry.path)
+            try:
+                relative_path = os.path.relpath(path, root_dir)
+            except ValueError:
+                # Paths on different drives on Windows
+                relative_path = path
+            frames.append(
+                {
+                    "file": relative_path if len(relative_path) < len(path) else path,
+                    "line": entry.lineno + 1,
+                    "function": entry.name,
+                }
+            )
+        if frames:
+            frames[-1]["exception"] = excinfo.typename
+        return frames
+
+    @staticmethod
+    def split_chunks(content: bytes, chunk_size: int) -> typing.List[bytes]:
+        """Split UTF-8 content into chunks without splitting characters."""
+        if not chunk_size or len(content) <= chunk_size:
+            return [content]
+        chunks = []
+        start = 0
+        while start < len(content):
+            end = min(start + chunk_size, len(content))
+            # Move back to the first byte of a multi-byte character
+            while (
+                end < len(content) and end > start + 1 and content[end] & 0xC0 == 0x80
+            ):
+                end -= 1
+            chunks.append(content[start:end])
+            start = end
+        return chunks
+
+    @staticmethod
+    def get_short_traceback(reprtraceback, reprcrash) -> str:
+        """Render one location line per traceback entry and the crash message."""
+        lines = []
+        for entry in reprtraceback.reprentries:
+            location = getattr(entry, "reprfileloc", None)
+            if location is None:
+                continue
+            line = f"{location.path}:{location.lineno}"
+            if location.message:
+                line = f"{line}: {location.message}"
+            lines.append(line)
+        if reprcrash is not None:
+            lines.append(reprcrash.message)
+        return "\n".join(lines)
+
     def get_worker_id(self):
         """Extract the worker id"""
         worker_id = "default"
@@ -120,10 +292,21 @@ class LogReport(object):
         return worker_id
 
     @staticmethod
-    def get_failure_messge(item_report):
-        """Extract error message."""
+    def get_failure_messge(item_report, detail: str = "full"):
+        """Extract error message.
+
+        The detail level 'crash' only returns the crash message and 'short'
+        returns one line per traceback entry. Both avoid rendering the full
+        traceback with its source context.
+        """
         if item_report.passed:
             return ""
+        reprcrash = getattr(item_report.longrepr, "reprcrash", None)
+        if detail == "crash" and reprcrash is not None:
+            return reprcrash.message
+        reprtraceback = getattr(item_report.longrepr, "reprtraceback", None)
+        if detail == "short" and reprtraceback is not None:
+            return LogReport.get_short_traceback(reprtraceback, reprcrash)
         if hasattr(item_report, "longreprtext"):
             message = item_report.longreprtext
         elif hasattr(item_report.longrepr, "reprcrash"):
@@ -0,0 +1,81 @@
+"""Utilisation telemetry of pytest-xdist workers."""
+
+import time
+import typing
+
+
+class WorkerTelemetry:
+    """Measure busy and idle time of a pytest-xdist worker.
+
+    A worker is busy from the start until the finish of a test. The idle time
+    before each test is the time the worker waited for its next test, e.g.
+    for the scheduler of the controller.
+    """
+
+    def __init__(self) -> None:
+        """Initialize worker telemetry."""
+        self._start_time = time.perf_counter()
+        self._last_finish_time = self._start_time
+        self._test_start_time: typing.Optional[float] = None
+        self.tests = 0
+        self.busy = 0.0
+        self.queue_wait = 0.0
+        self.max_queue_wait = 0.0
+
+    def start_test(self) -> None:
+        """Mark the start of a test."""
+        now = time.perf_counter()
+        wait = now - self._last_finish_time
+        self.queue_wait += wait
+        self.max_queue_wait = max(self.max_queue_wait, wait)
+        self._test_start_time = now
+
+    def finish_test(self) -> None:
+        """Mark the finish of a test."""
+        if self._test_start_time is None:
+            return
+        now = time.perf_counter()
+        self.busy += now - self._test_start_time
+        self.tests += 1
+        self._last_finish_time = now
+        self._test_start_time = None
+
+    def to_dict(self) -> dict:
+        """Summarize the telemetry of the worker session.
+
+        Returns:
+            dict: Number of tests, session duration, busy and idle time, queue
+                waits in seconds and the utilisation of the worker.
+        """
+        duration = time.perf_counter() - self._start_time
+        return {
+            "tests": self.tests,
+            "duration": duration,
+            "busy": self.busy,
+            "idle": max(duration - self.busy, 0.0),
+            "queue_wait": self.queue_wait,
+            "max_queue_wait": self.max_queue_wait,
+            "utilization": self.busy / duration if duration else 0.0,
+        }
+
+
+def get_load_balance(workers: typing.Dict[str, dict]) -> dict:
+    """Compute the load balance of all workers of a session.
+
+    Args:
+        workers (typing.Dict[str, dict]): Telemetry summaries per worker ID.
+
+    Returns:
+        dict: Number of workers and tests, the overall utilisation and the
+            imbalance, i.e. the maximum busy time divided by the mean busy time
+            of the workers. An imbalance of 1.0 means a perfect balance.
+    """
+    busy = [worker["busy"] for worker in workers.values()]
+    duration = sum(worker["duration"] for worker in workers.values())
+    mean_busy = sum(busy) / len(busy) if busy else 0.0
+    return {
+        "workers": len(workers),
+        "tests": sum(worker["tests"] for worker in workers.values()),
+        "utilization": sum(busy) / duration if duration else 0.0,
+        "imbalance": max(busy) / mean_busy if mean_busy else 1.0,
+    }
@@ -21,6 +21,14 @@ def isinstance_patch(
     return isinstance(__obj, __class_or_tuple)
 
 
+@pytest.fixture(autouse=True)
+def settings_cache_dir(monkeypatch, tmp_path) -> pathlib.Path:
+    """Keep the settings cache of each test in a temporary directory."""
+    cache_dir = tmp_path / "settings_cache"
+    monkeypatch.setenv("PYTEST_FLUENT_CACHE_DIR", str(cache_dir))
+    return cache_dir
+
+
 @pytest.fixture(scope="session")
 def logging_content():
     return "Logged from test_base"
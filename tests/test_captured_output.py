@@ -0,0 +1,91 @@
+import pytest
+
+from pytest_fluent.test_report import LogReport
+
+
+def get_report(call_args) -> dict:
+    return next(
+        call_arg.args[2]
+        for call_arg in call_args
+        if call_arg.args[2].get("when") == "call"
+    )
+
+
+def test_split_chunks_keeps_characters():
+    content = "aä" * 3
+    chunks = LogReport.split_chunks(content.encode("utf-8"), 2)
+    assert b"".join(chunks) == content.encode("utf-8")
+    assert [chunk.decode("utf-8") for chunk in chunks] == ["a", "ä", "a", "ä", "a", "ä"]
+
+
+def test_split_chunks_disabled():
+    assert LogReport.split_chunks(b"abcdef", 0) == [b"abcdef"]
+
+
+def test_captured_output_added(run_mocked_pytest, session_uuid):
+    runpytest, fluent_sender = run_mocked_pytest
+    result = runpytest(
+        f"--session-uuid={session_uuid}",
+        "--add-captured-output",
+        pyfile="""
+    import logging
+    import sys
+
+    def test_base():
+        print("to stdout")
+        sys.stderr.write("to stderr")
+        logging.getLogger().warning("to log")
+        assert False
+    """,
+    )
+    result.assert_outcomes(failed=1)
+    report = get_report(fluent_sender.emit_with_time.call_args_list)
+    captured = {section["section"]: section for section in report["captured"]}
+    assert captured["Captured stdout call"]["content"] == ["to stdout\n"]
+    assert captured["Captured stderr call"]["content"] == ["to stderr"]
+    assert "to log" in captured["Captured log call"]["content"][0]
+    assert not any("truncated" in section for section in captured.values())
+
+
+def test_captured_output_capped_and_chunked(run_mocked_pytest, session_uuid):
+    runpytest, fluent_sender = run_mocked_pytest
+    result = runpytest(
+        f"--session-uuid={session_uuid}",
+        "--add-captured-output",
+        "--captured-output-max-size=25",
+        "--captured-output-chunk-size=10",
+        pyfile="""
+    def test_base():
+        print("x" * 100)
+    """,
+    )
+    result.assert_outcomes(passed=1)
+    report = get_report(fluent_sender.emit_with_time.call_args_list)
+    section = report["captured"][0]
+    assert section["section"] == "Captured stdout call"
+    assert section["truncated"] is True
+    assert section["content"] == ["x" * 10, "x" * 10, "x" * 5]
+
+
+def test_captured_output_disabled(run_mocked_pytest, session_uuid):
+    runpytest, fluent_sender = run_mocked_pytest
+    result = runpytest(
+        f"--session-uuid={session_uuid}",
+        pyfile="""
+    def test_base():
+        print("to stdout")
+    """,
+    )
+    result.assert_outcomes(passed=1)
+    report = get_report(fluent_sender.emit_with_time.call_args_list)
+    assert "captured" not in report
+
+
+@pytest.mark.parametrize(
+    "option", ["--captured-output-max-size", "--captured-output-chunk-size"]
+)
+def test_negative_captured_output_size(run_mocked_pytest, option):
+    runpytest, _ = run_mocked_pytest
+    result = runpytest("--add-captured-output", f"{option}=-1")
+    assert result.ret == pytest.ExitCode.USAGE_ERROR
+    result.stderr.fnmatch_lines([f"*{option} must not be negative.*"])
@@ -0,0 +1,67 @@
+def get_collection_records(fluent_sender):
+    return [
+        call_arg.args[2]
+        for call_arg in fluent_sender.emit_with_time.call_args_list
+        if call_arg.args[2].get("type") == "collection"
+    ]
+
+
+def test_collection_telemetry(run_mocked_pytest, pytester, session_uuid):
+    runpytest, fluent_sender = run_mocked_pytest
+    pytester.makepyfile(
+        test_slow_import="""
+        import time
+
+        time.sleep(0.1)
+
+        class TestClass:
+            def test_a(self):
+                pass
+
+            def test_b(self):
+                pass
+        """,
+        test_broken="""
+        raise ImportError("Broken module")
+        """,
+    )
+    result = runpytest(
+        f"--session-uuid={session_uuid}",
+        "--collection-telemetry",
+        pyfile="""
+    def test_fast():
+        pass
+    """,
+    )
+    result.assert_outcomes(errors=1)
+    records = get_collection_records(fluent_sender)
+    assert len(records) == 1
+    record = records[0]
+    assert record["stage"] == "session"
+    assert record["sessionId"] == str(session_uuid)
+    assert record["items"] == 3
+    assert record["module_count"] == 3
+    assert record["errors"] == 1
+    modules = {module["module"]: module for module in record["modules"]}
+    assert record["modules"][0]["module"] == "test_slow_import.py"
+    assert modules["test_slow_import.py"]["duration"] >= 0.1
+    assert modules["test_slow_import.py"]["items"] == 2
+    assert modules["test_broken.py"]["errors"] == 1
+    assert modules["test_broken.py"]["items"] == 0
+    assert modules["test_collection_telemetry.py"]["items"] == 1
+    assert record["duration"] >= modules["test_slow_import.py"]["duration"]
+
+
+def test_collection_telemetry_disabled(run_mocked_pytest):
+    runpytest, fluent_sender = run_mocked_pytest
+    result = runpytest(
+        pyfile="""
+    def test_fast(request):
+        hook = request.config.pluginmanager.hook
+        for caller in (hook.pytest_collectstart, hook.pytest_collectreport):
+            names = [hookimpl.plugin_name for hookimpl in caller.get_hookimpls()]
+            assert not any("fluent" in name for name in names)
+    """,
+    )
+    result.assert_outcomes(passed=1)
+    assert get_collection_records(fluent_sender) == []
@@ -326,3 +326,28 @@ def test_get_tag_and_label(
         user_settings_patched[stage]["tag"],
         user_settings_patched[stage]["label"],
     )
+
+
+@pytest.mark.parametrize(
+    "settings,expected",
+    [
+        ({}, frozenset()),
+        ({"drop": ["markers", "when"]}, frozenset({"markers", "when"})),
+        (
+            {
+                "replace": {"keys": {"failure_message": "error", "when": "phase"}},
+                "drop": ["error", "when"],
+            },
+            frozenset({"failure_message", "error"}),
+        ),
+    ],
+)
+def test_get_dropped_keys(settings, expected, namespace, stage_names):
+    stage = "pytest_runtest_logreport"
+    patcher = ContentPatcher(
+        user_settings={"all": {"tag": "run", "label": "pytest"}, stage: settings},
+        args_settings=namespace,
+        stage_names=stage_names,
+    )
+    assert patcher.get_dropped_keys(stage) == expected
+    assert patcher.get_dropped_keys("logging") == frozenset()
@@ -0,0 +1,58 @@
+def test_bound_context_keeps_test_uid(runpytest):
+    result = runpytest(
+        pyfile="""
+    import threading
+
+    from pytest_fluent import bind_context, get_session_uid, get_test_uid
+
+    BOUND = {}
+
+    def test_first():
+        BOUND["test_uid"] = get_test_uid()
+        BOUND["function"] = bind_context(lambda: (get_session_uid(), get_test_uid()))
+
+    def test_second():
+        result = {}
+
+        def run():
+            result["value"] = BOUND["function"]()
+            result["unbound"] = get_test_uid()
+
+        thread = threading.Thread(target=run)
+        thread.start()
+        thread.join()
+        assert result["value"] == (get_session_uid(), BOUND["test_uid"])
+        assert result["unbound"] == get_test_uid() != BOUND["test_uid"]
+    """
+    )
+    result.assert_outcomes(passed=2)
+
+
+def test_asyncio_task_inherits_context(runpytest):
+    result = runpytest(
+        pyfile="""
+    import asyncio
+
+    from pytest_fluent import get_test_uid
+
+    TASKS = {}
+
+    def test_first():
+        loop = asyncio.new_event_loop()
+
+        async def report():
+            await asyncio.sleep(0)
+            return get_test_uid()
+
+        TASKS["loop"] = loop
+        TASKS["task"] = loop.create_task(report())
+        TASKS["test_uid"] = get_test_uid()
+
+    def test_second():
+        loop = TASKS["loop"]
+        assert loop.run_until_complete(TASKS["task"]) == TASKS["test_uid"]
+        assert get_test_uid() != TASKS["test_uid"]
+        loop.close()
+    """
+    )
+    result.assert_outcomes(passed=2)
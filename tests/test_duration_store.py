@@ -0,0 +1,123 @@
+import types
+
+import pytest
+
+from pytest_fluent.duration_store import SMOOTHING, DurationStore, order_by_duration
+
+
+def test_duration_store_smoothing(tmp_path):
+    store = DurationStore(str(tmp_path / "durations.db"))
+    assert store.load() == {}
+    store.update({"test_a": 1.0, "test_b": 2.0})
+    store.update({"test_a": 2.0})
+    durations = DurationStore(str(tmp_path / "durations.db")).load()
+    assert durations["test_a"] == pytest.approx(1.0 + SMOOTHING)
+    assert durations["test_b"] == 2.0
+
+
+def test_order_by_duration():
+    items = [types.SimpleNamespace(nodeid=nodeid) for nodeid in "abcd"]
+    durations = {"a": 1.0, "b": 3.0, "d": 1.0}
+    ordered = order_by_duration(items, durations)
+    assert [item.nodeid for item in ordered] == ["c", "b", "a", "d"]
+
+
+def test_order_by_duration_keeps_modules_and_classes_together():
+    nodeids = [
+        "a.py::test_1",
+        "a.py::test_2",
+        "b.py::TestClass::test_1",
+        "b.py::TestClass::test_2",
+        "b.py::test_3",
+    ]
+    items = [types.SimpleNamespace(nodeid=nodeid) for nodeid in nodeids]
+    durations = {
+        "a.py::test_1": 1.0,
+        "a.py::test_2": 5.0,
+        "b.py::TestClass::test_1": 3.0,
+        "b.py::TestClass::test_2": 4.0,
+        "b.py::test_3": 6.0,
+    }
+    ordered = order_by_duration(items, durations)
+    assert [item.nodeid for item in ordered] == [
+        "b.py::TestClass::test_2",
+        "b.py::TestClass::test_1",
+        "b.py::test_3",
+        "a.py::test_2",
+        "a.py::test_1",
+    ]
+
+
+def test_order_by_stored_duration(run_mocked_pytest, tmp_path):
+    runpytest, fluent_sender = run_mocked_pytest
+    store = tmp_path / "durations.db"
+    pyfile = """
+    import time
+
+    def test_short():
+        pass
+
+    def test_long():
+        time.sleep(0.1)
+    """
+    result = runpytest(f"--duration-store={store}", "-v", pyfile=pyfile)
+    result.assert_outcomes(passed=2)
+    assert set(DurationStore(str(store)).load()) == {
+        "test_order_by_stored_duration.py::test_short",
+        "test_order_by_stored_duration.py::test_long",
+    }
+    result = runpytest(
+        f"--duration-store={store}", "--order-by-duration", "-v", pyfile=pyfile
+    )
+    result.stdout.re_match_lines([".*::test_long PASSED", ".*::test_short PASSED"])
+
+
+def test_order_by_duration_sets_up_module_fixtures_once(
+    run_mocked_pytest, pytester, tmp_path
+):
+    runpytest, _ = run_mocked_pytest
+    store = tmp_path / "durations.db"
+    pytester.makepyfile(test_module_fixture="""
+        import time
+
+        import pytest
+
+        @pytest.fixture(scope="module")
+        def resource():
+            print("SETUP_RESOURCE")
+
+        def test_short(resource):
+            pass
+
+        def test_long(resource):
+            time.sleep(0.2)
+        """)
+    pyfile = """
+    import time
+
+    def test_medium():
+        time.sleep(0.1)
+    """
+    for _ in range(2):
+        result = runpytest(
+            f"--duration-store={store}",
+            "--order-by-duration",
+            "-s",
+            "-v",
+            pyfile=pyfile,
+        )
+        result.assert_outcomes(passed=3)
+    assert result.stdout.str().count("SETUP_RESOURCE") == 1
+    result.stdout.re_match_lines(
+        [
+            ".*test_module_fixture.py::test_long",
+            ".*test_module_fixture.py::test_short",
+            ".*::test_medium",
+        ]
+    )
+
+
+def test_order_by_duration_requires_store(run_mocked_pytest):
+    runpytest, _ = run_mocked_pytest
+    result = runpytest("--order-by-duration")
+    assert result.ret == pytest.ExitCode.USAGE_ERROR
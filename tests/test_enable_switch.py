@@ -0,0 +1,91 @@
+import pytest
+
+PYFILE = """
+def test_base(request, session_uid, test_uid):
+    runtime = request.config.pluginmanager.get_plugin("fluent-reporter-runtime")
+    assert (runtime is not None) == {enabled}
+    assert (session_uid is not None) == {enabled}
+"""
+
+
+def test_disabled_by_option(run_mocked_pytest):
+    runpytest, fluent_sender = run_mocked_pytest
+    result = runpytest("--fluentd-disable", pyfile=PYFILE.format(enabled=False))
+    result.assert_outcomes(passed=1)
+    fluent_sender.emit_with_time.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "env_value, enabled", [("0", False), ("false", False), ("1", True), ("", True)]
+)
+def test_enabled_by_env(run_mocked_pytest, monkeypatch, env_value, enabled):
+    runpytest, fluent_sender = run_mocked_pytest
+    monkeypatch.setenv("PYTEST_FLUENTD_ENABLED", env_value)
+    result = runpytest(pyfile=PYFILE.format(enabled=enabled))
+    result.assert_outcomes(passed=1)
+    assert fluent_sender.emit_with_time.called == enabled
+
+
+def test_disabled_by_ini(pytester, run_mocked_pytest):
+    runpytest, fluent_sender = run_mocked_pytest
+    pytester.makeini("[pytest]\nfluentd_enabled = false")
+    result = runpytest(pyfile=PYFILE.format(enabled=False))
+    result.assert_outcomes(passed=1)
+    fluent_sender.emit_with_time.assert_not_called()
+
+
+def test_option_overrides_env_and_ini(pytester, run_mocked_pytest, monkeypatch):
+    runpytest, fluent_sender = run_mocked_pytest
+    monkeypatch.setenv("PYTEST_FLUENTD_ENABLED", "off")
+    pytester.makeini("[pytest]\nfluentd_enabled = false")
+    result = runpytest("--fluentd-enable", pyfile=PYFILE.format(enabled=True))
+    result.assert_outcomes(passed=1)
+    fluent_sender.emit_with_time.assert_called()
+
+
+def test_disabled_get_logger(run_mocked_pytest):
+    runpytest, fluent_sender = run_mocked_pytest
+    result = runpytest(
+        "--fluentd-disable",
+        pyfile="""
+    def test_base(get_logger):
+        logger = get_logger("my.Logger")
+        assert logger.handlers == []
+        logger.info("not sent")
+    """,
+    )
+    result.assert_outcomes(passed=1)
+    fluent_sender.emit_with_time.assert_not_called()
+
+
+def test_disabled_registers_no_runtime_hooks(run_mocked_pytest):
+    runpytest, _ = run_mocked_pytest
+    result = runpytest(
+        "--fluentd-disable",
+        pyfile="""
+    import pytest
+
+    @pytest.fixture
+    def value():
+        return 1
+
+    def test_hooks(request, value):
+        hook = request.config.pluginmanager.hook
+        for name in [
+            "pytest_collectstart",
+            "pytest_collectreport",
+            "pytest_collection_modifyitems",
+            "pytest_runtest_setup",
+            "pytest_runtest_makereport",
+            "pytest_runtest_logreport",
+            "pytest_runtest_logfinish",
+            "pytest_fixture_setup",
+            "pytest_fixture_post_finalizer",
+            "pytest_report_to_serializable",
+        ]:
+            hookimpls = getattr(hook, name).get_hookimpls()
+            names = [hookimpl.plugin_name for hookimpl in hookimpls]
+            assert not any("fluent" in name for name in names), name
+    """,
+    )
+    result.assert_outcomes(passed=1)
@@ -0,0 +1,92 @@
+import logging
+import os
+import typing
+from unittest.mock import patch
+
+import pytest
+from fluent.handler import FluentHandler
+
+import pytest_fluent.event
+from pytest_fluent.event import Event
+from pytest_fluent.fluent_handler import BufferedFluentHandler
+from pytest_fluent.plugin import add_handler
+
+fork_only = pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+
+
+def run_in_fork(function) -> int:
+    pid = os.fork()
+    if pid == 0:
+        code = 1
+        try:
+            code = 0 if function() else 1
+        finally:
+            os._exit(code)
+    _, status = os.waitpid(pid, 0)
+    return os.WEXITSTATUS(status)
+
+
+@patch("pytest_fluent.event.FluentSender")
+def test_senders_are_created_lazily(sender):
+    event = Event(["unittest", ""], "abc", 8080)
+    assert event.senders == {}
+    with patch.object(pytest_fluent.event, "isinstance", lambda *_: True):
+        event("unittest", "pytest", {"status": "start"})
+        event("unittest", "pytest", {"status": "finish"})
+    sender.assert_called_once_with(tag="unittest", host="abc", port=8080)
+    assert sender.return_value.emit_with_time.call_count == 2
+
+
+@fork_only
+@patch("pytest_fluent.event.FluentSender")
+def test_senders_are_dropped_in_forked_child(sender):
+    event = Event(["unittest"])
+    with patch.object(pytest_fluent.event, "isinstance", lambda *_: True):
+        event("unittest", "pytest", {"status": "start"})
+    assert "unittest" in event.senders
+    assert run_in_fork(lambda: event.senders == {}) == 0
+    assert "unittest" in event.senders
+
+
+@fork_only
+def test_handler_sender_is_dropped_in_forked_child():
+    logger = logging.getLogger("test_handler_sender_is_dropped_in_forked_child")
+    handler = typing.cast(
+        FluentHandler, add_handler("localhost", 24224, "unittest", logger)
+    )
+    try:
+        parent_sender = handler.sender
+        assert run_in_fork(lambda: handler._sender is None) == 0
+        assert handler.sender is parent_sender
+    finally:
+        logger.removeHandler(handler)
+        handler.close()
+
+
+@fork_only
+def test_buffered_records_are_dropped_in_forked_child():
+    logger = logging.getLogger("test_buffered_records_are_dropped_in_forked_child")
+    handler = typing.cast(
+        BufferedFluentHandler,
+        add_handler("localhost", 24224, "unittest", logger, buffer_size=10),
+    )
+    try:
+        handler._buffer.append("test", {"message": "parent"})
+        assert run_in_fork(lambda: handler._buffer.pop("test") == ([], 0)) == 0
+        assert handler._buffer.pop("test") == ([{"message": "parent"}], 0)
+    finally:
+        logger.removeHandler(handler)
+        handler.close()
+
+
+@patch("pytest_fluent.event.AsyncFluentSender")
+@patch("pytest_fluent.event.FluentSender")
+def test_background_senders(sender, async_sender):
+    event = Event(["unittest"], background=True)
+    with patch.object(pytest_fluent.event, "isinstance", lambda *_: True):
+        event("unittest", "pytest", {"status": "start"})
+    sender.assert_not_called()
+    async_sender.return_value.emit_with_time.assert_called_once()
+    event.close()
+    async_sender.return_value.close.assert_called_once()
+    assert event.senders == {}
@@ -0,0 +1,145 @@
+import types
+
+import pytest
+
+from pytest_fluent.fixture_timing import FixtureStatistics, FixtureTimer
+
+PYFILE = """
+import time
+
+import pytest
+
+@pytest.fixture(scope="module")
+def database():
+    time.sleep(0.05)
+    yield
+    time.sleep(0.1)
+
+@pytest.fixture
+def client(database):
+    yield
+
+def test_first(client):
+    pass
+
+def test_second(client):
+    pass
+"""
+
+
+def get_records(fluent_sender):
+    return [
+        call_arg.args[2] for call_arg in fluent_sender.emit_with_time.call_args_list
+    ]
+
+
+def test_fixture_statistics():
+    statistics = FixtureStatistics()
+    statistics.add(
+        [
+            {"name": "a", "scope": "function", "setup": 1.0, "teardown": 2.0},
+            {"name": "b", "scope": "module", "setup": 10.0},
+        ]
+    )
+    statistics.add([{"name": "a", "scope": "function", "setup": 3.0}])
+    fixture_b, fixture_a = statistics.to_records()
+    assert fixture_a["setups"] == 2
+    assert fixture_a["setup_total"] == 4.0
+    assert fixture_a["setup_max"] == 3.0
+    assert fixture_a["teardowns"] == 1
+    assert fixture_b["teardowns"] == 0
+
+
+def test_fixture_timing_per_test(run_mocked_pytest):
+    runpytest, fluent_sender = run_mocked_pytest
+    result = runpytest("--fixture-timing=test", pyfile=PYFILE)
+    result.assert_outcomes(passed=2)
+    finish = [
+        record
+        for record in get_records(fluent_sender)
+        if record.get("status") == "finish" and record["stage"] == "testcase"
+    ]
+    first, second = [
+        {fixture["name"]: fixture for fixture in record["fixtures"]}
+        for record in finish
+    ]
+    assert first["database"]["scope"] == "module"
+    assert first["database"]["setup"] >= 0.05
+    assert "teardown" not in first["database"]
+    assert set(first["client"]) == {"name", "scope", "setup", "teardown"}
+    assert "database" not in second or "setup" not in second["database"]
+    # The module fixture is torn down after the last test of the module
+    assert second["database"]["teardown"] >= 0.1
+    assert second["client"]["teardown"] < 0.1
+
+
+def test_fixture_timing_per_session(run_mocked_pytest):
+    runpytest, fluent_sender = run_mocked_pytest
+    result = runpytest("--fixture-timing=session", pyfile=PYFILE)
+    result.assert_outcomes(passed=2)
+    records = get_records(fluent_sender)
+    assert all("fixtures" not in record for record in records)
+    fixtures = [record for record in records if record.get("type") == "fixture"]
+    assert [fixture["name"] for fixture in fixtures] == ["database", "client"]
+    database, client = fixtures
+    assert database["stage"] == "session"
+    assert database["setups"] == 1
+    assert database["teardowns"] == 1
+    assert database["setup_total"] >= 0.05
+    assert database["teardown_max"] >= 0.1
+    assert client["setups"] == 2
+    assert client["teardowns"] == 2
+
+
+@pytest.mark.parametrize("fixture_timing", ["test", "session"])
+def test_fixture_timing_setup_error(run_mocked_pytest, fixture_timing):
+    runpytest, fluent_sender = run_mocked_pytest
+    result = runpytest(
+        f"--fixture-timing={fixture_timing}",
+        pyfile="""
+    import pytest
+
+    @pytest.fixture
+    def broken():
+        raise ValueError("Setup failed")
+
+    def test_broken(broken):
+        pass
+    """,
+    )
+    result.assert_outcomes(errors=1)
+    names = []
+    for record in get_records(fluent_sender):
+        if record.get("type") == "fixture":
+            names.append(record["name"])
+        names.extend(fixture["name"] for fixture in record.get("fixtures", []))
+    assert names == ["broken"]
+
+
+def test_fixture_timer_ignores_unknown_teardown():
+    timer = FixtureTimer()
+    timer.finish_teardown(types.SimpleNamespace(argname="a", scope="function"))
+    assert timer.pop_timings() == []
+
+
+@pytest.mark.parametrize(
+    "args, registered",
+    [((), False), (("--fixture-timing=test",), True), (("--fluentd-disable",), False)],
+)
+def test_fixture_hooks_registered_only_when_enabled(
+    run_mocked_pytest, args, registered
+):
+    runpytest, _ = run_mocked_pytest
+    result = runpytest(
+        *args,
+        pyfile=f"""
+    def test_hooks(request):
+        hook = request.config.pluginmanager.hook
+        for caller in (hook.pytest_fixture_setup, hook.pytest_fixture_post_finalizer):
+            names = [hookimpl.plugin_name for hookimpl in caller.get_hookimpls()]
+            plugin_name = "fluent-fixture-timing"
+            assert (plugin_name in names) == {registered}
+            assert not any("fluent" in name for name in names if name != plugin_name)
+    """,
+    )
+    result.assert_outcomes(passed=1)
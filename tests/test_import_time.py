@@ -0,0 +1,20 @@
+import json
+import subprocess
+import sys
+
+LAZY_MODULES = ["fluent", "jsonschema", "msgpack", "ruamel.yaml", "sqlite3"]
+
+
+def test_lazy_modules_are_not_imported():
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import json, sys; import pytest_fluent.plugin; "
+            f"print(json.dumps([m for m in {LAZY_MODULES} if m in sys.modules]))",
+        ],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    assert json.loads(result.stdout) == []
@@ -0,0 +1,107 @@
+import pytest
+
+from pytest_fluent.fluent_handler import BufferedFluentHandler
+from pytest_fluent.log_buffer import LogBuffer
+
+
+def get_logging_records(call_args):
+    return [
+        call_arg.args[2]
+        for call_arg in call_args
+        if call_arg.args[2].get("type") == "logging"
+    ]
+
+
+def test_log_buffer_is_bounded():
+    buffer = LogBuffer(2)
+    for idx in range(5):
+        buffer.append("test", {"message": idx})
+    records, dropped = buffer.pop("test")
+    assert records == [{"message": 3}, {"message": 4}]
+    assert dropped == 3
+    assert buffer.pop("test") == ([], 0)
+
+
+def test_log_buffer_discard():
+    buffer = LogBuffer(10)
+    buffer.append("test", {"message": "abc"})
+    buffer.discard("test")
+    assert buffer.pop("test") == ([], 0)
+
+
+def test_log_buffer_invalid_size():
+    with pytest.raises(ValueError):
+        LogBuffer(0)
+    with pytest.raises(ValueError):
+        BufferedFluentHandler("tag", 0)
+
+
+def test_passed_test_logs_are_discarded(run_mocked_pytest, session_uuid):
+    runpytest, fluent_sender = run_mocked_pytest
+    result = runpytest(
+        f"--session-uuid={session_uuid}",
+        "--extend-logging",
+        "--log-on-failure",
+        pyfile="""
+    import logging
+
+    def test_base():
+        logging.getLogger().info("passed")
+        assert True
+    """,
+    )
+    result.assert_outcomes(passed=1)
+    call_args = fluent_sender.emit_with_time.call_args_list
+    assert get_logging_records(call_args) == []
+    assert len(call_args) == 5
+
+
+def test_failed_test_logs_are_sent_as_batch(run_mocked_pytest, session_uuid):
+    runpytest, fluent_sender = run_mocked_pytest
+    result = runpytest(
+        f"--session-uuid={session_uuid}",
+        "--extend-logging",
+        "--log-on-failure",
+        "--log-buffer-size=2",
+        pyfile="""
+    import logging
+
+    def test_base():
+        for idx in range(3):
+            logging.getLogger().info("message %s", idx)
+        assert False
+    """,
+    )
+    result.assert_outcomes(failed=1)
+    call_args = fluent_sender.emit_with_time.call_args_list
+    batches = get_logging_records(call_args)
+    assert len(batches) == 1
+    batch = batches[0]
+    assert batch["sessionId"] == str(session_uuid)
+    assert batch["stage"] == "testcase"
+    assert [record["message"] for record in batch["records"]] == [
+        "message 1",
+        "message 2",
+    ]
+    assert batch["droppedRecords"] == 1
+    finish = [
+        call_arg.args[2]
+        for call_arg in call_args
+        if call_arg.args[2].get("status") == "finish"
+        and call_arg.args[2].get("stage") == "testcase"
+    ]
+    assert finish[0]["testId"] == batch["testId"]
+
+
+def test_log_on_failure_requires_extend_logging(run_mocked_pytest):
+    runpytest, _ = run_mocked_pytest
+    result = runpytest("--log-on-failure")
+    assert result.ret == pytest.ExitCode.USAGE_ERROR
+
+
+def test_log_buffer_size_must_be_positive(run_mocked_pytest):
+    runpytest, _ = run_mocked_pytest
+    result = runpytest("--extend-logging", "--log-on-failure", "--log-buffer-size=0")
+    assert result.ret == pytest.ExitCode.USAGE_ERROR
+    result.stderr.fnmatch_lines(["*--log-buffer-size must be at least 1.*"])
+    assert "INTERNALERROR" not in result.stderr.str()
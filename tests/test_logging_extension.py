@@ -1,8 +1,11 @@
+import asyncio
 import logging
 from unittest.mock import MagicMock, patch
 
 from pytest_fluent.content_patcher import ContentPatcher
 from pytest_fluent.plugin import (
+    BufferedFluentHandler,
+    LoopAwareFluentHandler,
     RecordFormatter,
     add_handler,
     get_formatter,
@@ -42,3 +45,77 @@ def test_add_handler(mock_fluent_handler: MagicMock):
     )
     mock_fluent_handler.return_value.setFormatter.assert_called_once()
     logger.addHandler.assert_called_once_with(mock_fluent_handler.return_value)
+
+
+@patch("pytest_fluent.plugin.AsyncFluentHandler")
+def test_add_handler_background(mock_fluent_handler: MagicMock):
+    logger = MagicMock(spec=logging.Logger)
+    add_handler("abc", 8080, "test.tag", logger, transport="background")
+    mock_fluent_handler.assert_called_once_with(
+        "test.tag", host="abc", port=8080, buffer_overflow_handler=overflow_handler
+    )
+    logger.addHandler.assert_called_once_with(mock_fluent_handler.return_value)
+
+
+@patch("fluent.asyncsender.FluentSender")
+@patch("fluent.handler.sender.FluentSender")
+def test_loop_aware_handler(mock_sender: MagicMock, mock_async_sender: MagicMock):
+    logger = logging.getLogger("test_loop_aware_handler")
+    logger.propagate = False
+    handler = add_handler("abc", 8080, "test.tag", logger, transport="auto")
+    assert isinstance(handler, LoopAwareFluentHandler)
+    try:
+        logger.warning("outside of event loop")
+
+        async def log_in_loop():
+            logger.warning("inside of event loop")
+
+        asyncio.run(log_in_loop())
+    finally:
+        logger.removeHandler(handler)
+        handler.close()
+    blocking_calls = mock_sender.return_value.emit_with_time.call_args_list
+    background_calls = mock_async_sender.return_value.emit_with_time.call_args_list
+    assert [call.args[2]["message"] for call in blocking_calls] == [
+        "outside of event loop"
+    ]
+    assert [call.args[2]["message"] for call in background_calls] == [
+        "inside of event loop"
+    ]
+
+
+@patch("fluent.asyncsender.FluentSender")
+@patch("fluent.handler.sender.FluentSender")
+def test_buffered_handler_transport(
+    mock_sender: MagicMock, mock_async_sender: MagicMock
+):
+    logger = logging.getLogger("test_buffered_handler_transport")
+    logger.propagate = False
+    handlers = [
+        add_handler(
+            "abc", 8080, "test.tag", logger, buffer_size=10, transport=transport
+        )
+        for transport in ["background", "auto"]
+    ]
+    assert all(isinstance(handler, BufferedFluentHandler) for handler in handlers)
+    try:
+        logger.warning("outside of event loop")
+
+        async def log_in_loop():
+            logger.warning("inside of event loop")
+
+        asyncio.run(log_in_loop())
+    finally:
+        for handler in handlers:
+            logger.removeHandler(handler)
+            handler.close()
+    blocking_calls = mock_sender.return_value.emit_with_time.call_args_list
+    background_calls = mock_async_sender.return_value.emit_with_time.call_args_list
+    assert [call.args[2]["message"] for call in blocking_calls] == [
+        "outside of event loop"
+    ]
+    assert [call.args[2]["message"] for call in background_calls] == [
+        "outside of event loop",
+        "inside of event loop",
+        "inside of event loop",
+    ]
@@ -1,12 +1,20 @@
 import argparse
 import json
 import os
+import time
 from io import StringIO
+from unittest.mock import patch
 
+import jsonschema
 import pytest
 from ruamel.yaml import YAML
 
-from pytest_fluent.setting_file_loader_action import SettingFileLoaderAction
+from pytest_fluent.plugin import get_stage_settings
+from pytest_fluent.setting_file_loader_action import (
+    SettingFileLoaderAction,
+    load_and_check_settings_file,
+    load_default_settings,
+)
 
 parser = argparse.ArgumentParser()
 parser.add_argument(
@@ -109,3 +117,48 @@ def test_wrong_input_format():
                 "abc-def",
             ]
         )
+
+
+def test_settings_are_cached(default, settings_cache_dir):
+    file_name = os.path.join(os.path.dirname(__file__), "data", "default.yaml")
+    assert load_and_check_settings_file(file_name) == default
+    assert len(list(settings_cache_dir.glob("*.json"))) == 1
+    with patch(
+        "pytest_fluent.setting_file_loader_action.get_schema_validator"
+    ) as validator:
+        assert load_and_check_settings_file(file_name) == default
+    validator.assert_not_called()
+
+
+def test_settings_cache_disabled(default, monkeypatch, settings_cache_dir):
+    monkeypatch.setenv("PYTEST_FLUENT_CACHE_DIR", "")
+    assert load_default_settings() == default
+    assert not settings_cache_dir.exists()
+
+
+def test_invalid_settings_are_not_cached(settings_cache_dir):
+    with pytest.raises(jsonschema.ValidationError):
+        load_and_check_settings_file('json;{"any": {"tag": "x"}}')
+    assert not list(settings_cache_dir.glob("*.json"))
+
+
+def test_settings_cache_is_bounded(settings_cache_dir):
+    def load(label):
+        load_and_check_settings_file(f'json;{{"all": {{"label": "{label}"}}}}')
+        time.sleep(0.01)
+
+    with patch("pytest_fluent.setting_file_loader_action.MAX_CACHE_ENTRIES", 2):
+        for label in ["a", "b", "a", "c"]:
+            load(label)
+    cached = [
+        json.loads(path.read_text()) for path in settings_cache_dir.glob("*.json")
+    ]
+    # The least recently used settings are evicted
+    assert sorted(settings["all"]["label"] for settings in cached) == ["a", "c"]
+
+
+def test_default_stage_settings_are_loaded_lazily(pytester, settings_cache_dir):
+    config = pytester.parseconfig("--fluentd-disable")
+    assert config.getoption("stage_settings") is None
+    assert not settings_cache_dir.exists()
+    assert get_stage_settings(config) == load_default_settings()
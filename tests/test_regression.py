@@ -0,0 +1,81 @@
+import pytest
+
+from pytest_fluent.duration_store import DurationStore
+from pytest_fluent.plugin import CALL_DURATIONS_TABLE
+from pytest_fluent.regression import RegressionDetector
+
+
+def get_call_records(fluent_sender):
+    return {
+        call_arg.args[2]["name"].split("::")[-1]: call_arg.args[2]
+        for call_arg in fluent_sender.emit_with_time.call_args_list
+        if call_arg.args[2].get("when") == "call"
+    }
+
+
+def test_regression_detector():
+    detector = RegressionDetector(
+        {"a": 1.0, "b": 0.001, "c": 2.0}, threshold=1.5, min_delta=0.1
+    )
+    assert detector.check("a", 2.0) is not None
+    assert detector.check("b", 0.01) is None
+    assert detector.check("c", 2.5) is None
+    assert detector.check("d", 10.0) is None
+    assert detector.get_fields("a", 1.2) == {
+        "durationBaseline": 1.0,
+        "regression": False,
+    }
+    assert detector.get_fields("d", 1.0) == {}
+    detector.check("c", 8.0)
+    assert [regression.nodeid for regression in detector.get_top(5)] == ["c", "a"]
+    assert detector.get_top(1)[0].ratio == 4.0
+
+
+def test_detect_regressions(run_mocked_pytest, tmp_path):
+    runpytest, fluent_sender = run_mocked_pytest
+    store = tmp_path / "durations.db"
+    DurationStore(str(store), table=CALL_DURATIONS_TABLE).update(
+        {
+            "test_detect_regressions.py::test_slow": 0.01,
+            "test_detect_regressions.py::test_fast": 10.0,
+        }
+    )
+    result = runpytest(
+        f"--duration-store={store}",
+        "--detect-regressions",
+        pyfile="""
+    import time
+
+    def test_slow():
+        time.sleep(0.2)
+
+    def test_fast():
+        pass
+
+    def test_new():
+        pass
+    """,
+    )
+    result.assert_outcomes(passed=3)
+    records = get_call_records(fluent_sender)
+    assert records["test_slow"]["durationBaseline"] == 0.01
+    assert records["test_slow"]["regression"] is True
+    assert records["test_fast"]["regression"] is False
+    assert "durationBaseline" not in records["test_new"]
+    result.stdout.re_match_lines(
+        [".*duration regressions.*", r".*baseline 0\.010s.*::test_slow"]
+    )
+    assert "::test_fast" not in result.stdout.str()
+    baselines = DurationStore(str(store), table=CALL_DURATIONS_TABLE).load()
+    assert set(baselines) == {
+        "test_detect_regressions.py::test_slow",
+        "test_detect_regressions.py::test_fast",
+        "test_detect_regressions.py::test_new",
+    }
+    assert baselines["test_detect_regressions.py::test_slow"] > 0.01
+
+
+def test_detect_regressions_requires_store(run_mocked_pytest):
+    runpytest, _ = run_mocked_pytest
+    result = runpytest("--detect-regressions")
+    assert result.ret == pytest.ExitCode.USAGE_ERROR
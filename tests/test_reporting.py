@@ -1,3 +1,6 @@
+import pytest
+
+
 def test_data_reporter_base_with_passed(run_mocked_pytest, session_uuid):
     runpytest, fluent_sender = run_mocked_pytest
     result = runpytest(
@@ -136,3 +139,202 @@ def test_data_reporter_base_with_setup_exception(run_mocked_pytest, session_uuid
     assert args.get("when") == "setup"
     assert args.get("outcome") == "error"
     assert "failure_message" in args
+
+
+FAILING_TEST = """
+    def helper(value):
+        assert value == 2, "Value is wrong"
+
+    def test_base():
+        helper(1)
+    """
+
+
+def test_data_reporter_failure_detail_crash(run_mocked_pytest, session_uuid):
+    runpytest, fluent_sender = run_mocked_pytest
+    _ = runpytest(
+        f"--session-uuid={session_uuid}",
+        "--failure-detail=crash",
+        pyfile=FAILING_TEST,
+    )
+    args = fluent_sender.emit_with_time.call_args_list[2].args[2]
+    assert args.get("when") == "call"
+    assert args["failure_message"] == "AssertionError: Value is wrong\nassert 1 == 2"
+
+
+def test_data_reporter_failure_detail_short(run_mocked_pytest, session_uuid):
+    runpytest, fluent_sender = run_mocked_pytest
+    _ = runpytest(
+        f"--session-uuid={session_uuid}",
+        "--failure-detail=short",
+        pyfile=FAILING_TEST,
+    )
+    args = fluent_sender.emit_with_time.call_args_list[2].args[2]
+    lines = args["failure_message"].splitlines()
+    assert lines[0].endswith("test_data_reporter_failure_detail_short.py:5")
+    assert lines[1].endswith(
+        "test_data_reporter_failure_detail_short.py:2: AssertionError"
+    )
+    assert lines[2:] == ["AssertionError: Value is wrong", "assert 1 == 2"]
+
+
+def test_data_reporter_failure_message_max_size(run_mocked_pytest, session_uuid):
+    runpytest, fluent_sender = run_mocked_pytest
+    _ = runpytest(
+        f"--session-uuid={session_uuid}",
+        "--failure-message-max-size=10",
+        pyfile=FAILING_TEST,
+    )
+    args = fluent_sender.emit_with_time.call_args_list[2].args[2]
+    assert len(args["failure_message"]) == 10
+    assert args["failure_message_truncated"] is True
+
+
+def test_failure_message_max_size_must_not_be_negative(run_mocked_pytest):
+    runpytest, _ = run_mocked_pytest
+    result = runpytest("--failure-message-max-size=-1", pyfile=FAILING_TEST)
+    assert result.ret == pytest.ExitCode.USAGE_ERROR
+    result.stderr.fnmatch_lines(["*--failure-message-max-size must not be negative.*"])
+
+
+def test_data_reporter_deduplicate_failures(run_mocked_pytest, session_uuid):
+    runpytest, fluent_sender = run_mocked_pytest
+    _ = runpytest(
+        f"--session-uuid={session_uuid}",
+        "--deduplicate-failures",
+        "--failure-detail=crash",
+        pyfile="""
+    import pytest
+
+    @pytest.fixture
+    def broken():
+        raise ValueError('Value is wrong')
+
+    @pytest.mark.parametrize("value", range(3))
+    def test_base(broken, value):
+        assert True
+
+    def test_other():
+        assert False
+    """,
+    )
+    call_args = [x.args[2] for x in fluent_sender.emit_with_time.call_args_list]
+    failures = [x for x in call_args if x.get("type") == "failure"]
+    reports = [x for x in call_args if x.get("outcome") in ["error", "failed"]]
+    assert len(failures) == 2
+    assert len(reports) == 4
+    messages = {x["failure_hash"]: x["failure_message"] for x in failures}
+    assert messages[reports[0]["failure_hash"]] == "ValueError: Value is wrong"
+    assert messages[reports[3]["failure_hash"]] == "assert False"
+    assert len({x["failure_hash"] for x in reports[:3]}) == 1
+    assert not any("failure_message" in x for x in reports)
+    assert call_args.index(failures[0]) < call_args.index(reports[0])
+
+
+@pytest.mark.parametrize("tb_style", ["auto", "short", "line", "native", "no"])
+def test_data_reporter_structured_traceback(run_mocked_pytest, session_uuid, tb_style):
+    runpytest, fluent_sender = run_mocked_pytest
+    _ = runpytest(
+        f"--session-uuid={session_uuid}",
+        "--structured-traceback",
+        f"--tb={tb_style}",
+        pyfile=FAILING_TEST,
+    )
+    args = fluent_sender.emit_with_time.call_args_list[2].args[2]
+    file_name = "test_data_reporter_structured_traceback.py"
+    assert args["traceback"] == [
+        {"file": file_name, "line": 5, "function": "test_base"},
+        {
+            "file": file_name,
+            "line": 2,
+            "function": "helper",
+            "exception": "AssertionError",
+        },
+    ]
+
+
+def test_data_reporter_intern_traceback_paths(run_mocked_pytest, session_uuid):
+    runpytest, fluent_sender = run_mocked_pytest
+    _ = runpytest(
+        f"--session-uuid={session_uuid}",
+        "--structured-traceback",
+        "--intern-traceback-paths",
+        pyfile="""
+    import pytest
+
+    @pytest.mark.parametrize("value", range(2))
+    def test_base(value):
+        assert False
+    """,
+    )
+    call_args = [x.args[2] for x in fluent_sender.emit_with_time.call_args_list]
+    files = [x for x in call_args if x.get("type") == "file"]
+    reports = [x for x in call_args if x.get("outcome") == "failed"]
+    assert files == [
+        {
+            "type": "file",
+            "stage": "testcase",
+            "sessionId": str(session_uuid),
+            "file_index": 0,
+            "file": "test_data_reporter_intern_traceback_paths.py",
+        }
+    ]
+    for report in reports:
+        assert report["traceback"] == [
+            {
+                "file": 0,
+                "line": 5,
+                "function": "test_base",
+                "exception": "AssertionError",
+            }
+        ]
+
+
+MARKED_TEST = """
+    import pytest
+
+    class Settings:
+        def __repr__(self):
+            return "Settings()"
+
+    @pytest.mark.slow
+    @pytest.mark.parametrize("value", [Settings()], ids=["settings"])
+    def test_base(value):
+        assert True
+    """
+
+
+@pytest.mark.parametrize(
+    "marker_format,expected",
+    [
+        ("names", ["parametrize", "slow"]),
+        (
+            "args",
+            [
+                {
+                    "name": "parametrize",
+                    "args": ["value", ["Settings()"]],
+                    "kwargs": {"ids": ["settings"]},
+                },
+                {"name": "slow", "args": [], "kwargs": {}},
+            ],
+        ),
+    ],
+)
+def test_data_reporter_marker_format(
+    run_mocked_pytest, session_uuid, marker_format, expected
+):
+    runpytest, fluent_sender = run_mocked_pytest
+    _ = runpytest(
+        f"--session-uuid={session_uuid}",
+        f"--marker-format={marker_format}",
+        pyfile=MARKED_TEST,
+    )
+    args = fluent_sender.emit_with_time.call_args_list[2].args[2]
+    assert args["markers"] == expected
+
+
+def test_intern_traceback_paths_requires_structured_traceback(run_mocked_pytest):
+    runpytest, _ = run_mocked_pytest
+    result = runpytest("--intern-traceback-paths")
+    assert result.ret == pytest.ExitCode.USAGE_ERROR
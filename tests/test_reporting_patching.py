@@ -173,3 +173,51 @@ def test_data_reporter_with_patched_values(
             if key in ["duration", "testId", "host", "markers"]:
                 continue
             assert report[key] == expected[key]
+
+
+def test_dropped_fields_are_not_computed(
+    pytester, run_mocked_pytest, session_uuid, monkeypatch
+):
+    runpytest, fluent_sender = run_mocked_pytest
+    pytester.makefile(
+        ".json",
+        patch_file=json.dumps(
+            {
+                "all": {"tag": "<fluentd-tag>", "label": "<fluentd-label>"},
+                "pytest_runtest_logreport": {
+                    "drop": ["failure_message", "markers", "docstring"]
+                },
+            }
+        ),
+    )
+
+    def get_failure_message(item_report):
+        raise AssertionError("Dropped failure message computed")
+
+    monkeypatch.setattr(
+        "pytest_fluent.test_report.LogReport.get_failure_messge",
+        staticmethod(get_failure_message),
+    )
+    monkeypatch.setattr(
+        "pytest_fluent.plugin.get_test_docstring",
+        lambda item: pytest.fail("Dropped docstring computed"),
+    )
+    result = runpytest(
+        f"--session-uuid={session_uuid}",
+        "--stage-settings=patch_file.json",
+        "--add-docstrings",
+        pyfile="""
+    def test_base():
+        \"\"\"Docstring.\"\"\"
+        assert False
+    """,
+    )
+    result.assert_outcomes(failed=1)
+    report = next(
+        call_arg.args[2]
+        for call_arg in fluent_sender.emit_with_time.call_args_list
+        if call_arg.args[2].get("when") == "call"
+    )
+    assert "failure_message" not in report
+    assert "markers" not in report
+    assert "docstring" not in report
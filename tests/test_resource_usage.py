@@ -0,0 +1,49 @@
+import gc
+
+from pytest_fluent.resource_usage import ResourceMonitor, resource
+
+
+def test_resource_monitor():
+    monitor = ResourceMonitor()
+    monitor.start()
+    sum(range(100_000))
+    gc.collect()
+    usage = monitor.stop()
+    assert usage["gc_collections"][-1] >= 1
+    assert usage["gc_time"] > 0
+    if resource is not None:
+        assert usage["cpu_user"] + usage["cpu_system"] >= 0
+        assert usage["max_rss_delta"] >= 0
+    assert monitor._gc_callback not in gc.callbacks
+
+
+def test_resource_usage(run_mocked_pytest):
+    runpytest, fluent_sender = run_mocked_pytest
+    result = runpytest(
+        "--resource-usage",
+        pyfile="""
+    import gc
+
+    def test_memory():
+        data = bytearray(64 * 1024 * 1024)
+        gc.collect()
+        assert data
+    """,
+    )
+    result.assert_outcomes(passed=1)
+    records = [
+        call_arg.args[2] for call_arg in fluent_sender.emit_with_time.call_args_list
+    ]
+    usages = [record for record in records if "resourceUsage" in record]
+    assert len(usages) == 1
+    assert usages[0]["when"] == "call"
+    usage = usages[0]["resourceUsage"]
+    assert usage["gc_collections"][-1] >= 1
+    if resource is not None:
+        assert usage["max_rss_delta"] >= 0
+        assert {
+            "cpu_user",
+            "cpu_system",
+            "voluntary_context_switches",
+            "involuntary_context_switches",
+        } <= set(usage)
@@ -0,0 +1,98 @@
+import pytest
+
+from pytest_fluent.rollup import DurationHistogram, Rollup
+
+
+def test_duration_histogram_buckets():
+    histogram = DurationHistogram()
+    for duration in [0.0, 0.001, 0.001, 0.0011, 1.0]:
+        histogram.add(duration)
+    data = histogram.to_dict()
+    assert data["count"] == 5
+    assert data["min"] == 0.0
+    assert data["max"] == 1.0
+    assert data["sum"] == pytest.approx(1.0031)
+    assert sum(count for _, count in data["buckets"]) == 5
+    for upper_bound, _ in data["buckets"][1:]:
+        assert upper_bound > 0.0
+    # The relative error of a bucket is bounded by its logarithmic width
+    assert 0.001 <= data["p50"] <= 0.001 * 2**0.25
+    assert data["p99"] == 1.0
+
+
+def test_duration_histogram_empty():
+    assert DurationHistogram().to_dict() == {"count": 0}
+
+
+def test_rollup_groups():
+    rollup = Rollup()
+    rollup.add("test_a.py::test_1", ["slow"], "passed", 0.1)
+    rollup.add("test_a.py::test_2", [], "failed", 0.2)
+    rollup.add("test_b.py::test_1", ["slow"], "passed", 0.3)
+    records = {(x["group"], x["name"]): x for x in rollup.to_records()}
+    assert set(records) == {
+        ("marker", "slow"),
+        ("module", "test_a.py"),
+        ("module", "test_b.py"),
+    }
+    assert records[("module", "test_a.py")]["outcomes"] == {"passed": 1, "failed": 1}
+    assert records[("marker", "slow")]["outcomes"] == {"passed": 2}
+    assert records[("marker", "slow")]["durations"]["count"] == 2
+
+
+ROLLUP_TESTS = """
+    import pytest
+
+    @pytest.mark.slow
+    @pytest.mark.parametrize("value", range(3))
+    def test_passed(value):
+        assert True
+
+    def test_failed():
+        assert False
+    """
+
+
+def test_rollup_records(run_mocked_pytest, session_uuid):
+    runpytest, fluent_sender = run_mocked_pytest
+    result = runpytest(
+        f"--session-uuid={session_uuid}",
+        "--rollup",
+        pyfile=ROLLUP_TESTS,
+    )
+    result.assert_outcomes(passed=3, failed=1)
+    records = [x.args[2] for x in fluent_sender.emit_with_time.call_args_list]
+    assert [x.get("type") for x in records] == [None, *["rollup"] * 3, None]
+    parametrize, marker, module = records[1:4]
+    assert parametrize["group"] == "marker"
+    assert parametrize["name"] == "parametrize"
+    assert marker["group"] == "marker"
+    assert marker["name"] == "slow"
+    assert marker["outcomes"] == {"passed": 3}
+    assert marker["sessionId"] == str(session_uuid)
+    assert module["group"] == "module"
+    assert module["name"] == "test_rollup_records.py"
+    assert module["outcomes"] == {"passed": 3, "error": 1}
+    assert module["durations"]["count"] == 4
+
+
+@pytest.mark.parametrize("single_test_record", [False, True])
+def test_rollup_failures(run_mocked_pytest, session_uuid, single_test_record):
+    runpytest, fluent_sender = run_mocked_pytest
+    args = [f"--session-uuid={session_uuid}", "--rollup", "--rollup-failures"]
+    if single_test_record:
+        args.append("--single-test-record")
+    result = runpytest(*args, pyfile=ROLLUP_TESTS)
+    result.assert_outcomes(passed=3, failed=1)
+    records = [x.args[2] for x in fluent_sender.emit_with_time.call_args_list]
+    reports = [x for x in records if x.get("stage") == "testcase"]
+    assert len(reports) == 1
+    assert reports[0]["name"] == "test_rollup_failures.py::test_failed"
+    assert reports[0]["outcome"] == "error"
+    assert len([x for x in records if x.get("type") == "rollup"]) == 3
+
+
+def test_rollup_failures_requires_rollup(run_mocked_pytest):
+    runpytest, _ = run_mocked_pytest
+    result = runpytest("--rollup-failures")
+    assert result.ret == pytest.ExitCode.USAGE_ERROR
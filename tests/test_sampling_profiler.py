@@ -0,0 +1,84 @@
+import sys
+import threading
+import time
+
+import pytest
+
+from pytest_fluent.sampling_profiler import SamplingProfiler, collapse_stack
+
+
+def busy_wait(duration):
+    end_time = time.perf_counter() + duration
+    while time.perf_counter() < end_time:
+        pass
+
+
+def test_collapse_stack():
+    stack = collapse_stack(sys._getframe())
+    assert stack.endswith("test_sampling_profiler.py:test_collapse_stack")
+    assert "runner.py" not in stack
+
+
+def test_sampling_profiler():
+    profiler = SamplingProfiler(0.001)
+    try:
+        profiler.start()
+        busy_wait(0.1)
+        samples = profiler.stop()
+        assert sum(samples.values()) > 10
+        stack, _ = samples.most_common(1)[0]
+        assert stack.endswith("test_sampling_profiler.py:busy_wait")
+        profile = profiler.to_profile(samples)
+        assert profile["interval"] == 0.001
+        assert profile["samples"] == sum(samples.values())
+        assert profile["stacks"][0] == {"stack": stack, "count": samples[stack]}
+        # No samples are taken while the profiler is stopped
+        busy_wait(0.02)
+        profiler.start()
+        assert sum(profiler.stop().values()) < 5
+    finally:
+        profiler.close()
+    assert all(
+        thread.name != "pytest-fluent-profiler" for thread in threading.enumerate()
+    )
+
+
+def test_profile_slow_tests(run_mocked_pytest):
+    runpytest, fluent_sender = run_mocked_pytest
+    result = runpytest(
+        "--profile-slow-tests=0.1",
+        "--profile-interval=0.001",
+        pyfile="""
+    import time
+
+    def wait(duration):
+        end_time = time.perf_counter() + duration
+        while time.perf_counter() < end_time:
+            pass
+
+    def test_slow():
+        wait(0.2)
+
+    def test_fast():
+        pass
+    """,
+    )
+    result.assert_outcomes(passed=2)
+    records = {
+        call_arg.args[2]["name"].split("::")[-1]: call_arg.args[2]
+        for call_arg in fluent_sender.emit_with_time.call_args_list
+        if call_arg.args[2].get("when") == "call"
+    }
+    assert "profile" not in records["test_fast"]
+    profile = records["test_slow"]["profile"]
+    assert profile["samples"] > 10
+    assert profile["stacks"][0]["stack"].endswith(
+        "test_profile_slow_tests.py:test_slow;test_profile_slow_tests.py:wait"
+    )
+
+
+@pytest.mark.parametrize("interval", ["0", "-0.001"])
+def test_profile_interval_must_be_positive(run_mocked_pytest, interval):
+    runpytest, _ = run_mocked_pytest
+    result = runpytest("--profile-slow-tests=0.1", f"--profile-interval={interval}")
+    assert result.ret == pytest.ExitCode.USAGE_ERROR
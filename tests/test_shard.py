@@ -0,0 +1,113 @@
+import pytest
+
+from pytest_fluent.shard import merge_shard_summaries
+
+SHARD_TESTS = [
+    """
+    def test_one():
+        assert True
+
+    def test_two():
+        assert False
+    """,
+    """
+    def test_three():
+        assert True
+    """,
+]
+
+
+def get_records(fluent_sender):
+    records = [x.args[2] for x in fluent_sender.emit_with_time.call_args_list]
+    fluent_sender.emit_with_time.reset_mock()
+    return records
+
+
+@pytest.mark.parametrize("rollup", [False, True])
+def test_shard_summary_merged_by_last_shard(
+    pytester, run_mocked_pytest, session_uuid, tmp_path, rollup
+):
+    runpytest, fluent_sender = run_mocked_pytest
+    summaries = []
+    for shard_index, pyfile in enumerate(SHARD_TESTS):
+        args = [
+            f"--session-uuid={session_uuid}",
+            f"--shard-index={shard_index}",
+            "--shard-count=2",
+            f"--shard-dir={tmp_path / 'shards'}",
+        ]
+        if rollup:
+            args.append("--rollup")
+        runpytest(*args, pyfile=pyfile)
+        records = get_records(fluent_sender)
+        session = [x for x in records if x.get("status") in ["start", "finish"]]
+        assert session[0]["shardIndex"] == shard_index
+        assert session[0]["shardCount"] == 2
+        summaries.append([x for x in records if x.get("type") == "session_summary"])
+    assert summaries[0] == []
+    (summary,) = summaries[1]
+    assert summary["sessionId"] == str(session_uuid)
+    assert summary["shards"] == 2
+    assert summary["shardCount"] == 2
+    assert summary["tests"] == 3
+    assert summary["outcomes"] == {"passed": 2, "error": 1}
+    if rollup:
+        (module,) = summary["rollup"]
+        assert module["name"] == "test_shard_summary_merged_by_last_shard.py"
+        assert module["durations"]["count"] == 3
+    else:
+        assert "rollup" not in summary
+
+
+def test_shard_summary_with_xdist_workers(run_mocked_pytest, session_uuid, tmp_path):
+    runpytest, fluent_sender = run_mocked_pytest
+    result = runpytest(
+        "-n",
+        "2",
+        "--emit-from-workers",
+        f"--session-uuid={session_uuid}",
+        "--shard-index=0",
+        "--shard-count=1",
+        f"--shard-dir={tmp_path / 'shards'}",
+        "--rollup",
+        pyfile=SHARD_TESTS[0] + SHARD_TESTS[1],
+    )
+    result.assert_outcomes(passed=2, failed=1)
+    records = get_records(fluent_sender)
+    (rollup,) = [x for x in records if x.get("type") == "rollup"]
+    assert rollup["durations"]["count"] == 3
+    (summary,) = [x for x in records if x.get("type") == "session_summary"]
+    assert summary["tests"] == 3
+    assert summary["outcomes"] == {"passed": 2, "error": 1}
+    (module,) = summary["rollup"]
+    assert module["durations"]["count"] == 3
+
+
+def test_merge_shard_summaries():
+    merged = merge_shard_summaries(
+        [
+            {"tests": 2, "outcomes": {"passed": 2}, "duration": 3.0},
+            {"tests": 1, "outcomes": {"passed": 1}, "duration": 1.0},
+        ]
+    )
+    assert merged == {
+        "shards": 2,
+        "tests": 3,
+        "outcomes": {"passed": 3},
+        "duration": 3.0,
+        "shard_duration": 4.0,
+    }
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        ["--shard-index=0"],
+        ["--shard-index=2", "--shard-count=2"],
+        ["--shard-dir=shards"],
+    ],
+)
+def test_invalid_shard_options(run_mocked_pytest, args):
+    runpytest, _ = run_mocked_pytest
+    result = runpytest(*args)
+    assert result.ret == pytest.ExitCode.USAGE_ERROR
@@ -0,0 +1,70 @@
+def get_records(call_args):
+    return [call_arg.args[2] for call_arg in call_args]
+
+
+def test_single_test_record(run_mocked_pytest, session_uuid):
+    runpytest, fluent_sender = run_mocked_pytest
+    result = runpytest(
+        f"--session-uuid={session_uuid}",
+        "--single-test-record",
+        pyfile="""
+    import pytest
+
+    @pytest.fixture
+    def resource():
+        raise ValueError("Setup failed")
+
+    def test_passed():
+        assert True
+
+    def test_failed():
+        assert False
+
+    def test_setup(resource):
+        assert True
+    """,
+    )
+    result.assert_outcomes(passed=1, failed=1, errors=1)
+    records = get_records(fluent_sender.emit_with_time.call_args_list)
+    assert len(records) == 5
+    assert records[0]["stage"] == "session"
+    assert records[-1]["stage"] == "session"
+    passed, failed, setup = records[1:4]
+    for record in [passed, failed, setup]:
+        assert record["stage"] == "testcase"
+        assert record["sessionId"] == str(session_uuid)
+        assert "testId" in record
+        assert "status" not in record
+        assert record["start_time"] <= record["finish_time"]
+    assert passed["name"].endswith("::test_passed")
+    assert passed["outcome"] == "passed"
+    assert passed["when"] == "call"
+    assert set(passed["durations"]) == {"setup", "call", "teardown"}
+    assert failed["when"] == "call"
+    assert "failure_message" in failed
+    assert setup["outcome"] == "error"
+    assert setup["when"] == "setup"
+    assert set(setup["durations"]) == {"setup", "teardown"}
+    assert "Setup failed" in setup["failure_message"]
+
+
+def test_single_test_record_with_callbacks(run_mocked_pytest, session_uuid):
+    runpytest, fluent_sender = run_mocked_pytest
+    result = runpytest(
+        f"--session-uuid={session_uuid}",
+        "--single-test-record",
+        pyfile="""
+    from pytest_fluent import additional_test_information_callback
+
+    @additional_test_information_callback
+    def test_information() -> dict:
+        return {"more": "information"}
+
+    def test_passed():
+        assert True
+    """,
+    )
+    result.assert_outcomes(passed=1)
+    records = get_records(fluent_sender.emit_with_time.call_args_list)
+    assert len(records) == 3
+    assert records[1]["more"] == "information"
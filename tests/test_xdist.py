@@ -0,0 +1,161 @@
+import json
+
+import pytest
+
+from pytest_fluent.worker_telemetry import get_load_balance
+
+WORKER_CONFTEST = """
+import json
+
+import pytest_fluent.event
+from fluent.sender import FluentSender
+
+
+class RecordingSender(FluentSender):
+    def emit_with_time(self, label, timestamp, data):
+        with open("worker_records.jsonl", "a") as fid:
+            fid.write(json.dumps(data) + "\\n")
+        return True
+
+
+def pytest_configure(config):
+    if hasattr(config, "workerinput"):
+        pytest_fluent.event.FluentSender = RecordingSender
+"""
+
+TESTS = """
+    def test_one():
+        assert True
+
+    def test_two():
+        assert False
+
+    def test_three():
+        assert True
+    """
+
+
+def get_worker_records(pytester):
+    path = pytester.path / "worker_records.jsonl"
+    if not path.exists():
+        return []
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_emit_from_workers(pytester, run_mocked_pytest, session_uuid):
+    runpytest, fluent_sender = run_mocked_pytest
+    pytester.makeconftest(WORKER_CONFTEST)
+    result = runpytest("-n", "2", "--emit-from-workers", pyfile=TESTS)
+    result.assert_outcomes(passed=2, failed=1)
+    controller = [x.args[2] for x in fluent_sender.emit_with_time.call_args_list]
+    assert [x["stage"] for x in controller] == ["session", "session"]
+    session_id = controller[0]["sessionId"]
+    workers = get_worker_records(pytester)
+    assert all(x["stage"] == "testcase" for x in workers)
+    assert all(x["sessionId"] == session_id for x in workers)
+    assert {x["workerId"] for x in workers} <= {"gw0", "gw1"}
+    reports = sorted((x["name"], x["outcome"]) for x in workers if "outcome" in x)
+    assert reports == [
+        ("test_emit_from_workers.py::test_one", "passed"),
+        ("test_emit_from_workers.py::test_three", "passed"),
+        ("test_emit_from_workers.py::test_two", "error"),
+    ]
+    assert len([x for x in workers if x.get("status") == "start"]) == 3
+
+
+def test_workers_share_controller_session_id(pytester, run_mocked_pytest):
+    runpytest, fluent_sender = run_mocked_pytest
+    pytester.makeconftest(WORKER_CONFTEST)
+    result = runpytest("-n", "2", pyfile=TESTS)
+    result.assert_outcomes(passed=2, failed=1)
+    controller = [x.args[2] for x in fluent_sender.emit_with_time.call_args_list]
+    session_id = controller[0]["sessionId"]
+    workers = get_worker_records(pytester)
+    assert workers
+    assert all(x["sessionId"] == session_id for x in workers)
+    assert not any("workerId" in x for x in workers)
+    assert not any("outcome" in x for x in workers)
+
+
+class ReportCollector:
+    def __init__(self):
+        self.reports = []
+
+    def pytest_runtest_logreport(self, report):
+        self.reports.append(report)
+
+
+def test_slim_xdist_reports(run_mocked_pytest):
+    runpytest, fluent_sender = run_mocked_pytest
+    collector = ReportCollector()
+    result = runpytest(
+        "-n",
+        "2",
+        "--slim-xdist-reports",
+        "--marker-format=names",
+        "--structured-traceback",
+        plugins=[collector],
+        pyfile="""
+    import pytest
+
+    @pytest.mark.slow
+    def test_one():
+        assert True
+
+    def test_two():
+        assert False
+    """,
+    )
+    result.assert_outcomes(passed=1, failed=1)
+    for report in collector.reports:
+        assert report.keywords == {}
+        assert set(report.stash) == {"fluent_report"}
+    records = [x.args[2] for x in fluent_sender.emit_with_time.call_args_list]
+    reports = {x["name"]: x for x in records if "outcome" in x}
+    passed = reports["test_slim_xdist_reports.py::test_one"]
+    assert passed["outcome"] == "passed"
+    assert passed["markers"] == ["slow"]
+    failed = reports["test_slim_xdist_reports.py::test_two"]
+    assert failed["outcome"] == "error"
+    assert "assert False" in failed["failure_message"]
+    assert failed["traceback"][0]["function"] == "test_two"
+    assert "test_two" in result.stdout.str()
+
+
+def test_worker_telemetry(run_mocked_pytest, session_uuid):
+    runpytest, fluent_sender = run_mocked_pytest
+    result = runpytest(
+        "-n",
+        "2",
+        f"--session-uuid={session_uuid}",
+        "--worker-telemetry",
+        pyfile=TESTS,
+    )
+    result.assert_outcomes(passed=2, failed=1)
+    records = [x.args[2] for x in fluent_sender.emit_with_time.call_args_list]
+    workers = [x for x in records if x.get("type") == "worker"]
+    assert [x["workerId"] for x in workers] == ["gw0", "gw1"]
+    for worker in workers:
+        assert worker["stage"] == "session"
+        assert worker["sessionId"] == str(session_uuid)
+        assert worker["busy"] + worker["idle"] == pytest.approx(worker["duration"])
+        assert 0.0 <= worker["utilization"] <= 1.0
+        assert worker["max_queue_wait"] <= worker["queue_wait"]
+    (load_balance,) = [x for x in records if x.get("type") == "load_balance"]
+    assert load_balance["workers"] == 2
+    assert load_balance["tests"] == 3
+    assert load_balance["imbalance"] >= 1.0
+    assert records[-1]["status"] == "finish"
+
+
+def test_get_load_balance():
+    workers = {
+        "gw0": {"tests": 2, "duration": 2.0, "busy": 1.5},
+        "gw1": {"tests": 1, "duration": 2.0, "busy": 0.5},
+    }
+    assert get_load_balance(workers) == {
+        "workers": 2,
+        "tests": 3,
+        "utilization": 0.5,
+        "imbalance": 1.5,
+    }